@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+HTTP connection pool benchmark
+==============================
+
+Starts a local stub of the Judgment API and sends the same bursty request
+load twice: once through module-level ``requests.post`` (a new connection
+per call, which is what judgeval does on its own) and once through the
+pooled keep-alive session the server installs. Reports p50/p99 latency and
+throughput for both.
+
+Usage:
+    python benchmarks/bench_http_pool.py [--requests 2000] [--concurrency 8]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server  # noqa: E402
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Header ve body tek pakette gitsin; aksi halde keep-alive bağlantıda
+    # Nagle + delayed ACK her isteğe ~40 ms ekler
+    disable_nagle_algorithm = True
+    latency = 0.0
+    body = b"{}"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        if self.latency:
+            time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_stub(latency, payload_bytes, port_queue):
+    StubHandler.latency = latency
+    StubHandler.body = json.dumps({"data": "x" * payload_bytes}).encode()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    httpd.daemon_threads = True
+    port_queue.put(httpd.server_address[1])
+    httpd.serve_forever()
+
+
+def start_stub(latency, payload_bytes):
+    """Run the stub API in its own process so it does not share our GIL"""
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=serve_stub, args=(latency, payload_bytes, port_queue),
+        daemon=True,
+    )
+    process.start()
+    return process, port_queue.get(timeout=10)
+
+
+def run(post, url, total, concurrency):
+    payload = {"trace_id": "benchmark"}
+
+    def one(_):
+        start = time.perf_counter()
+        response = post(url, json=payload, timeout=30)
+        response.raise_for_status()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = sorted(pool.map(one, range(total)))
+    return latencies, time.perf_counter() - start
+
+
+def report(label, latencies, elapsed):
+    ms = [x * 1000 for x in latencies]
+    p99 = ms[min(len(ms) - 1, int(len(ms) * 0.99))]
+    print(f"{label:<16} p50 {statistics.median(ms):7.2f} ms   "
+          f"p99 {p99:7.2f} ms   {len(ms) / elapsed:8.0f} req/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=1.0,
+                        help="Server-side processing time per request")
+    parser.add_argument("--payload-bytes", type=int, default=2048)
+    args = parser.parse_args()
+
+    stub, port = start_stub(args.latency_ms / 1000, args.payload_bytes)
+    url = f"http://127.0.0.1:{port}/traces/fetch/"
+
+    session = server.build_http_session(pool_size=args.concurrency)
+    try:
+        report("requests.post", *run(requests.post, url, args.requests,
+                                     args.concurrency))
+        report("pooled session", *run(session.post, url, args.requests,
+                                      args.concurrency))
+    finally:
+        session.close()
+        stub.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+push_dataset append benchmark
+=============================
+
+Appends a small delta to datasets of growing size and reports how many
+examples cross the wire and how long the call takes. With the incremental
+append path the cost follows the delta size, not the dataset size.
+
+The default push (``deduplicate`` on) is reported both cold, where the
+first append of a process pulls the dataset once to build its duplicate
+index, and warm, where the index already exists; ``no-dedup`` is the
+incremental path with ``deduplicate: false``.
+
+The Judgment API is replaced by an in-memory client that charges a fixed
+per-example transfer cost, so no network access is needed. judgeval must be
+importable (``pip install judgeval``) for the Example model.
+
+Usage:
+    python benchmarks/bench_push_append.py [--delta 10] [--sizes 1000,10000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server  # noqa: E402
+
+
+class CountingDataset:
+    def __init__(self):
+        self.examples = []
+        self.traces = []
+
+
+class CountingClient:
+    """In-memory stand-in that counts examples transferred in each direction"""
+
+    def __init__(self, per_example_cost, with_append_api):
+        self.per_example_cost = per_example_cost
+        self.datasets = {}
+        self.transferred = 0
+        if with_append_api:
+            self.append_dataset = self._append_dataset
+
+    def _transfer(self, count):
+        self.transferred += count
+        time.sleep(count * self.per_example_cost)
+
+    def create_project(self, project_name):
+        raise Exception("400: project already exists")
+
+    def create_dataset(self):
+        return CountingDataset()
+
+    def pull_dataset(self, alias, project_name):
+        ds = self.datasets[(alias, project_name)]
+        self._transfer(len(ds.examples))
+        pulled = CountingDataset()
+        pulled.examples = list(ds.examples)
+        return pulled
+
+    def push_dataset(self, alias, dataset, project_name, overwrite=False):
+        self._transfer(len(dataset.examples))
+        self.datasets[(alias, project_name)] = dataset
+        return True
+
+    def _append_dataset(self, alias, examples, project_name):
+        self._transfer(len(examples))
+        self.datasets[(alias, project_name)].examples.extend(examples)
+        return True
+
+
+def seed(fake, size):
+    ds = CountingDataset()
+    ds.examples = [
+        server.Example(input=f"q{i}", expected_output=f"a{i}")
+        for i in range(size)
+    ]
+    fake.datasets[("bench", "bench-project")] = ds
+
+
+def append(delta, deduplicate, prefix):
+    examples = [
+        {"input": f"{prefix}-q{i}", "expected_output": f"{prefix}-a{i}"}
+        for i in range(delta)
+    ]
+    result = server.execute_tool("push_dataset", {
+        "alias": "bench",
+        "project_name": "bench-project",
+        "examples": examples,
+        "append": True,
+        "deduplicate": deduplicate,
+    })
+    status = json.loads(result["content"][0]["text"])
+    assert status["status"] == "success", status
+
+
+def run(size, delta, per_example_cost, with_append_api, deduplicate=True,
+        warm=False):
+    fake = CountingClient(per_example_cost, with_append_api)
+    seed(fake, size)
+    server.client = fake
+    # Her koşu kendi (soğuk) dedup index'iyle başlar
+    server.dedup_index = server.DedupIndex()
+    if warm:
+        append(delta, deduplicate, "warmup")
+        fake.transferred = 0
+    start = time.perf_counter()
+    append(delta, deduplicate, "new")
+    elapsed = time.perf_counter() - start
+    return elapsed, fake.transferred
+
+
+def main():
+    server.import_judgeval()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--delta", type=int, default=10)
+    parser.add_argument("--sizes", default="1000,10000,50000,200000")
+    parser.add_argument("--per-example-us", type=float, default=5.0,
+                        help="Simulated transfer cost per example")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    cost = args.per_example_us / 1e6
+
+    print(f"{'mode':<12} {'dataset':>9} {'delta':>6} "
+          f"{'transferred':>12} {'seconds':>9}")
+    modes = (
+        ("full-repush", False, True, False),
+        ("no-dedup", True, False, False),
+        ("dedup-cold", True, True, False),
+        ("dedup-warm", True, True, True),
+    )
+    for label, with_append_api, deduplicate, warm in modes:
+        for size in sizes:
+            elapsed, transferred = run(size, args.delta, cost,
+                                       with_append_api, deduplicate, warm)
+            print(f"{label:<12} {size:>9} {args.delta:>6} "
+                  f"{transferred:>12} {elapsed:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
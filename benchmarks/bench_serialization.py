@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark
+=======================
+
+Serializes a large synthetic ``fetch_evaluation_results`` payload (pydantic
+scoring results with datetimes and UUIDs) the way the server used to
+(``json.dumps(default=str)``) and through the codec layer, with the stdlib
+fallback and with orjson when it is installed.
+
+Usage:
+    python benchmarks/bench_serialization.py [--rows 20000] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server  # noqa: E402
+
+
+class ScorerData(BaseModel):
+    name: str
+    threshold: float
+    success: bool
+    score: Optional[float] = None
+    reason: Optional[str] = None
+    evaluation_model: Optional[str] = None
+
+
+class DataObject(BaseModel):
+    example_id: uuid.UUID
+    input: str
+    actual_output: str
+    expected_output: str
+    created_at: datetime
+    additional_metadata: Dict[str, Any] = {}
+
+
+class ScoringResult(BaseModel):
+    success: bool
+    scorers_data: List[ScorerData]
+    data_object: DataObject
+
+
+def build_payload(rows):
+    now = datetime.now(timezone.utc)
+    results = []
+    for i in range(rows):
+        results.append(ScoringResult(
+            success=i % 4 != 0,
+            scorers_data=[
+                ScorerData(name="faithfulness", threshold=0.7,
+                           success=i % 4 != 0, score=(i % 100) / 100,
+                           reason="Claims are supported by the context",
+                           evaluation_model="gpt-4.1"),
+                ScorerData(name="answer_relevancy", threshold=0.5,
+                           success=True, score=0.9),
+            ],
+            data_object=DataObject(
+                example_id=uuid.uuid4(),
+                input=f"What is the capital of country #{i}?",
+                actual_output="The capital is somewhere nice.",
+                expected_output="A capital city.",
+                created_at=now,
+                additional_metadata={"batch": i // 100},
+            ),
+        ))
+    return [{"id": str(uuid.uuid4()), "results": results}]
+
+
+def timed(fn, repeat):
+    best = None
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = len(fn())
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payload = build_payload(args.rows)
+    orjson = server.orjson
+
+    cases = [
+        ("json default=str", lambda: json.dumps(payload, default=str)),
+    ]
+    server.orjson = None
+    cases.append(("codec stdlib", lambda: server.encode_json(payload)))
+    if orjson is not None:
+        cases.append(("codec orjson", lambda: orjson.dumps(
+            payload, default=server.json_default,
+            option=orjson.OPT_NON_STR_KEYS)))
+
+    print(f"{args.rows} scoring results, best of {args.repeat}")
+    for label, fn in cases:
+        elapsed, size = timed(fn, args.repeat)
+        print(f"{label:<18} {elapsed * 1000:9.1f} ms  {size / 1e6:7.2f} MB")
+    server.orjson = orjson
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark
+=================
+
+Launches server.py over stdio and measures the time from process start to
+the first ``initialize`` response and to the following ``tools/list``
+response. Run it against an older checkout with ``--server`` to compare.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 10] [--server path/to/server.py]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(server_path, env):
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, server_path],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=env,
+    )
+    try:
+        proc.stdin.write(b'{"jsonrpc": "2.0", "id": 1, '
+                         b'"method": "initialize", "params": {}}\n')
+        proc.stdin.flush()
+        json.loads(proc.stdout.readline())
+        initialize = time.perf_counter() - start
+
+        proc.stdin.write(b'{"jsonrpc": "2.0", "id": 2, '
+                         b'"method": "tools/list"}\n')
+        proc.stdin.flush()
+        json.loads(proc.stdout.readline())
+        tools_list = time.perf_counter() - start
+    finally:
+        proc.stdin.close()
+        proc.kill()
+        proc.wait()
+    return initialize, tools_list
+
+
+def summarize(label, samples):
+    ms = [s * 1000 for s in samples]
+    print(f"{label:<12} min {min(ms):8.1f} ms   median "
+          f"{statistics.median(ms):8.1f} ms   max {max(ms):8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--server", default=os.path.join(ROOT, "server.py"))
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    # Başlangıç yolu API key olmadan farklı çalışır
+    env.setdefault("JUDGMENT_API_KEY", "benchmark-key")
+
+    results = [measure(args.server, env) for _ in range(args.runs)]
+    print(f"{args.server} ({args.runs} runs)")
+    summarize("initialize", [r[0] for r in results])
+    summarize("tools/list", [r[1] for r in results])
+
+
+if __name__ == "__main__":
+    main()
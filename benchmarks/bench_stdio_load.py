@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Stdio load benchmark
+====================
+
+Starts the fake Judgment API (``fake_judgment_api.py``), launches server.py
+over stdio with ``JUDGMENT_API_URL`` pointed at it and replays tool calls
+with a fixed number of requests in flight. Each tool runs against a fresh
+server process so its peak RSS can be reported on its own; ``--mix`` adds
+a final run that interleaves all selected tools on a single process.
+
+Reports throughput, p50/p90/p99/max latency (request written to response
+read) and the server's peak RSS for each tool. Peak RSS is read from
+``/proc`` and shows ``n/a`` on other platforms.
+
+Usage:
+    python benchmarks/bench_stdio_load.py [--requests 200] [--concurrency 8]
+        [--tools get_trace,get_dataset] [--mix] [--latency-ms 20]
+        [--payload-bytes 1024] [--rows 100] [--warmup 1]
+        [--api-url http://...]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_judgment_api import start_fake_api  # noqa: E402
+
+PROJECT = "benchmark"
+
+
+def sample_examples(count):
+    return [{"input": f"question {i}", "actual_output": f"answer {i}",
+             "expected_output": f"answer {i}"} for i in range(count)]
+
+
+# Tool adı -> i. çağrının argümanları (id'ler cache'e takılmasın diye)
+WORKLOADS = {
+    "get_trace": lambda i: {"trace_id": f"trace-{i}"},
+    "get_traces": lambda i: {
+        "trace_ids": [f"trace-{i}-{j}" for j in range(10)]
+    },
+    "delete_trace": lambda i: {"trace_id": f"trace-{i}"},
+    "run_evaluation": lambda i: {"evaluation_data": {
+        "project_name": PROJECT,
+        "eval_name": f"eval-{i}",
+        "examples": sample_examples(5),
+        "scorers": [{"score_type": "faithfulness", "threshold": 0.5}],
+        "model": "gpt-4.1",
+    }},
+    "get_evaluation_results": lambda i: {
+        "project_name": PROJECT, "eval_name": f"eval-{i}"
+    },
+    "get_dataset": lambda i: {"alias": f"dataset-{i}", "project_name": PROJECT},
+    "push_dataset": lambda i: {
+        "alias": f"dataset-{i}", "project_name": PROJECT,
+        "examples": sample_examples(20), "overwrite": True
+    },
+    "delete_dataset": lambda i: {
+        "alias": f"dataset-{i}", "project_name": PROJECT
+    },
+    "create_project": lambda i: {"project_name": f"{PROJECT}-{i}"},
+    "delete_project": lambda i: {"project_name": f"{PROJECT}-{i}"},
+}
+
+
+def peak_rss_mb(pid):
+    """High-water mark of the process' resident set (Linux only)"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class StdioServer:
+    """server.py subprocess with a reader thread matching responses by id"""
+
+    def __init__(self, server_path, env, concurrency):
+        self.proc = subprocess.Popen(
+            [sys.executable, server_path],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=env,
+        )
+        self.slots = threading.Semaphore(concurrency)
+        self.pending = {}
+        self.results = []
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        self.expected = 0
+        self.reader = threading.Thread(target=self.read_loop, daemon=True)
+        self.reader.start()
+
+    def read_loop(self):
+        for line in self.proc.stdout:
+            received = time.perf_counter()
+            try:
+                response = json.loads(line)
+            except ValueError:
+                continue
+            with self.lock:
+                entry = self.pending.pop(response.get("id"), None)
+                if entry is None:
+                    continue
+                tool, sent = entry
+                result = response.get("result") or {}
+                failed = "error" in response or bool(result.get("isError"))
+                self.results.append((tool, received - sent, failed))
+                finished = len(self.results) >= self.expected
+            self.slots.release()
+            if finished:
+                self.done.set()
+        self.done.set()
+
+    def send(self, request_id, method, params, tool=None):
+        frame = json.dumps({"jsonrpc": "2.0", "id": request_id,
+                            "method": method, "params": params})
+        with self.lock:
+            self.pending[request_id] = (tool or method, time.perf_counter())
+        self.proc.stdin.write(frame.encode() + b"\n")
+        self.proc.stdin.flush()
+
+    def run(self, calls, timeout):
+        """Send (tool, arguments) calls keeping the pool full; return wall time"""
+        self.expected = len(self.results) + len(calls)
+        self.done.clear()
+        start = time.perf_counter()
+        for request_id, (tool, arguments) in enumerate(calls, 1000):
+            if not self.slots.acquire(timeout=timeout):
+                break
+            self.send(request_id, "tools/call",
+                      {"name": tool, "arguments": arguments}, tool)
+        self.done.wait(timeout)
+        return time.perf_counter() - start
+
+    def initialize(self, timeout):
+        self.expected = 1
+        self.slots.acquire()
+        self.send(1, "initialize", {})
+        if not self.done.wait(timeout):
+            raise RuntimeError("server did not answer initialize")
+        self.results.clear()
+
+    def close(self):
+        rss = peak_rss_mb(self.proc.pid)
+        self.proc.stdin.close()
+        try:
+            self.proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        return rss
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1,
+                             int(len(sorted_values) * fraction))]
+
+
+def report(label, results, elapsed, rss, lost):
+    ms = sorted(r[1] * 1000 for r in results)
+    errors = sum(1 for r in results if r[2])
+    rss_text = f"{rss:7.1f}" if rss is not None else "    n/a"
+    if not ms:
+        print(f"{label:<24} no responses")
+        return
+    print(f"{label:<24} {len(ms):6d} {errors:5d} {lost:5d} "
+          f"{len(ms) / elapsed:8.1f} {percentile(ms, 0.5):8.1f} "
+          f"{percentile(ms, 0.9):8.1f} {percentile(ms, 0.99):8.1f} "
+          f"{ms[-1]:8.1f} {rss_text}")
+
+
+def run_workload(label, calls, args, env):
+    server = StdioServer(args.server, env, args.concurrency)
+    try:
+        server.initialize(args.timeout)
+        # İlk çağrılar judgeval import'unu ve client kurulumunu öder
+        if args.warmup:
+            server.run(calls[:args.warmup], args.timeout)
+            with server.lock:
+                server.results.clear()
+        elapsed = server.run(calls, args.timeout)
+        with server.lock:
+            results = list(server.results)
+            lost = len(server.pending)
+    finally:
+        rss = server.close()
+    report(label, results, elapsed, rss, lost)
+    return results, elapsed, rss
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=200,
+                        help="Tool calls per tool (and per tool in --mix)")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="Requests kept in flight")
+    parser.add_argument("--tools", default=",".join(WORKLOADS),
+                        help="Comma-separated tools to benchmark")
+    parser.add_argument("--mix", action="store_true",
+                        help="Also run all tools interleaved on one server")
+    parser.add_argument("--latency-ms", type=float, default=20.0,
+                        help="Fake API delay per HTTP request")
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--payload-bytes", type=int, default=1024,
+                        help="Padding per record returned by the fake API")
+    parser.add_argument("--rows", type=int, default=100,
+                        help="Examples per dataset / results per evaluation")
+    parser.add_argument("--api-url",
+                        help="Use this API instead of starting the fake one")
+    parser.add_argument("--timeout", type=float, default=120.0,
+                        help="Seconds to wait for a run to finish")
+    parser.add_argument("--warmup", type=int, default=1,
+                        help="Untimed calls sent before each run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--server", default=os.path.join(ROOT, "server.py"))
+    args = parser.parse_args()
+
+    tools = [t.strip() for t in args.tools.split(",") if t.strip()]
+    unknown = [t for t in tools if t not in WORKLOADS]
+    if unknown:
+        parser.error(f"unknown tools: {', '.join(unknown)}")
+
+    fake_api = None
+    api_url = args.api_url
+    if not api_url:
+        fake_api, api_url = start_fake_api(args.latency_ms, args.jitter_ms,
+                                           args.payload_bytes, args.rows)
+
+    env = dict(os.environ)
+    env["JUDGMENT_API_URL"] = api_url
+    env.setdefault("JUDGMENT_API_KEY", "benchmark-key")
+    env.setdefault("JUDGMENT_ORG_ID", "benchmark-org")
+    # Log dosyası ölçümü etkilemesin
+    env.setdefault("JUDGMENT_MCP_LOG_LEVEL", "WARNING")
+
+    print(f"{args.server} -> {api_url} ({args.requests} calls/tool, "
+          f"{args.concurrency} in flight)")
+    print(f"{'tool':<24} {'ok':>6} {'err':>5} {'lost':>5} {'req/s':>8} "
+          f"{'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+          f"{'RSS MB':>7}")
+    try:
+        for tool in tools:
+            calls = [(tool, WORKLOADS[tool](i)) for i in range(args.requests)]
+            run_workload(tool, calls, args, env)
+
+        if args.mix:
+            rng = random.Random(args.seed)
+            calls = list(itertools.chain.from_iterable(
+                [(tool, WORKLOADS[tool](i)) for i in range(args.requests)]
+                for tool in tools
+            ))
+            rng.shuffle(calls)
+            print()
+            results, elapsed, rss = run_workload("mixed", calls, args, env)
+            for tool in tools:
+                report(f"  {tool}", [r for r in results if r[0] == tool],
+                       elapsed, rss, 0)
+    finally:
+        if fake_api is not None:
+            fake_api.terminate()
+
+
+if __name__ == "__main__":
+    main()
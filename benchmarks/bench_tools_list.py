@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+tools/list throughput benchmark
+===============================
+
+Pipelines ``tools/list`` requests into a running server.py over stdio and
+reports messages per second. This exercises the stdin loop and the stdout
+writer without touching the Judgment API. Pass ``--server`` pointing at an
+older checkout to compare before/after.
+
+Usage:
+    python benchmarks/bench_tools_list.py [--messages 20000] [--server PATH]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(server_path, messages, env):
+    proc = subprocess.Popen(
+        [sys.executable, server_path],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=env,
+    )
+    # İlk cevap gelene kadar bekle, process başlangıcı ölçüme girmesin
+    proc.stdin.write(b'{"jsonrpc": "2.0", "id": 0, "method": "initialize"}\n')
+    proc.stdin.flush()
+    proc.stdout.readline()
+
+    def feed():
+        for i in range(1, messages + 1):
+            proc.stdin.write(b'{"jsonrpc": "2.0", "id": %d, '
+                             b'"method": "tools/list"}\n' % i)
+        proc.stdin.close()
+
+    start = time.perf_counter()
+    feeder = threading.Thread(target=feed)
+    feeder.start()
+    received = 0
+    for _ in range(messages):
+        if not proc.stdout.readline():
+            break
+        received += 1
+    elapsed = time.perf_counter() - start
+    feeder.join()
+    proc.wait()
+    return received, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--server", default=os.path.join(ROOT, "server.py"))
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("JUDGMENT_API_KEY", "benchmark-key")
+    env["JUDGMENT_MCP_EAGER_WARMUP"] = "0"
+
+    received, elapsed = run(args.server, args.messages, env)
+    print(f"{args.server}")
+    print(f"{received} responses in {elapsed:.3f} s "
+          f"-> {received / elapsed:,.0f} msg/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Fake Judgment API
+=================
+
+A local HTTP stand-in for the Judgment API endpoints the server uses:
+trace fetch/delete, evaluation run and results, dataset push/append/pull/
+delete and project create/delete. Every response is delayed by a
+configurable latency and padded to a configurable payload size, so the
+server's stdin loop and tool paths can be measured without network noise.
+
+Point judgeval at it with ``JUDGMENT_API_URL``. Unknown paths answer
+``{}`` with status 200 so newer judgeval endpoints do not break a run;
+they are listed on stderr with ``--verbose``.
+
+Usage:
+    python benchmarks/fake_judgment_api.py [--port 8765] [--latency-ms 20]
+        [--jitter-ms 5] [--payload-bytes 1024] [--rows 100]
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import sys
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeConfig:
+    latency = 0.0
+    jitter = 0.0
+    payload_bytes = 1024
+    rows = 100
+    verbose = False
+
+
+def padding(config):
+    return "x" * config.payload_bytes
+
+
+def example(config, index):
+    return {
+        "example_id": f"example-{index}",
+        "input": f"question {index} {padding(config)}",
+        "actual_output": f"answer {index}",
+        "expected_output": f"answer {index}",
+        "context": [f"context {index}"],
+        "retrieval_context": [],
+        "additional_metadata": {},
+        "created_at": "2025-01-01T00:00:00Z",
+    }
+
+
+def trace(config, trace_id):
+    return {
+        "trace_id": trace_id,
+        "name": "benchmark",
+        "project_name": "benchmark",
+        "created_at": "2025-01-01T00:00:00Z",
+        "duration": 0.25,
+        "trace_spans": [{
+            "span_id": str(uuid.uuid4()),
+            "function": "benchmark",
+            "inputs": {"payload": padding(config)},
+            "output": "ok",
+        }],
+    }
+
+
+def scoring_results(config, count):
+    return [{
+        "success": index % 5 != 0,
+        "scorers_data": [{
+            "name": "Faithfulness",
+            "score": (index % 10) / 10,
+            "threshold": 0.5,
+            "success": index % 5 != 0,
+            "reason": padding(config),
+        }],
+        "data_object": example(config, index),
+    } for index in range(count)]
+
+
+def handle_trace_fetch(body, config):
+    return trace(config, body.get("trace_id", "benchmark"))
+
+
+def handle_eval_run(body, config):
+    count = len(body.get("examples") or []) or 1
+    return scoring_results(config, count)
+
+
+def handle_eval_fetch(body, config):
+    return {"results": scoring_results(config, config.rows),
+            "ui_results_url": "http://localhost/results"}
+
+
+def handle_dataset_pull(body, config):
+    return {
+        "dataset_alias": body.get("dataset_alias") or body.get("alias"),
+        "examples": [example(config, index) for index in range(config.rows)],
+        "traces": [],
+    }
+
+
+def handle_ok(body, config):
+    return {"status": "ok"}
+
+
+def handle_created(body, config):
+    return {"status": "ok", "id": str(uuid.uuid4())}
+
+
+def handle_validate_key(body, config):
+    return {"detail": {"user_name": "benchmark",
+                       "organization_id": "benchmark"}}
+
+
+# Yol öneki -> cevap üreten fonksiyon (ilk eşleşen kullanılır)
+ROUTES = (
+    ("/traces/fetch", handle_trace_fetch),
+    ("/traces/delete", handle_ok),
+    ("/evaluate", handle_eval_run),
+    ("/fetch_experiment_run", handle_eval_fetch),
+    ("/fetch_eval_results", handle_eval_fetch),
+    ("/eval-run-name-exists", lambda body, config: {"exists": False}),
+    ("/log-eval-results", handle_created),
+    ("/datasets/pull", handle_dataset_pull),
+    ("/datasets/push", handle_created),
+    ("/datasets/append", handle_ok),
+    ("/datasets/delete", handle_ok),
+    ("/projects/add", handle_created),
+    ("/projects/delete", handle_ok),
+    ("/validate_api_key", handle_validate_key),
+    ("/auth/validate_api_key", handle_validate_key),
+)
+
+
+class FakeJudgmentHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Küçük cevaplarda Nagle + delayed ACK gecikmesini önler
+    disable_nagle_algorithm = True
+    config = FakeConfig
+
+    def handle_any(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else {}
+        except ValueError:
+            body = {}
+        if not isinstance(body, dict):
+            body = {}
+
+        path = self.path.split("?", 1)[0]
+        for prefix, handler in ROUTES:
+            if path.startswith(prefix):
+                result = handler(body, self.config)
+                break
+        else:
+            if self.config.verbose:
+                print(f"unknown path: {self.command} {path}", file=sys.stderr)
+            result = {}
+
+        delay = self.config.latency
+        if self.config.jitter:
+            delay += random.uniform(0, self.config.jitter)
+        if delay:
+            time.sleep(delay)
+
+        payload = json.dumps(result).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = handle_any
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port, latency_ms, jitter_ms, payload_bytes, rows, verbose=False,
+          port_queue=None):
+    FakeConfig.latency = latency_ms / 1000
+    FakeConfig.jitter = jitter_ms / 1000
+    FakeConfig.payload_bytes = payload_bytes
+    FakeConfig.rows = rows
+    FakeConfig.verbose = verbose
+    httpd = ThreadingHTTPServer(("127.0.0.1", port), FakeJudgmentHandler)
+    httpd.daemon_threads = True
+    if port_queue is not None:
+        port_queue.put(httpd.server_address[1])
+    httpd.serve_forever()
+
+
+def start_fake_api(latency_ms=0.0, jitter_ms=0.0, payload_bytes=1024,
+                   rows=100):
+    """Run the fake API in its own process; returns (process, base_url)"""
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=serve,
+        args=(0, latency_ms, jitter_ms, payload_bytes, rows),
+        kwargs={"port_queue": port_queue},
+        daemon=True,
+    )
+    process.start()
+    return process, f"http://127.0.0.1:{port_queue.get(timeout=10)}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=20.0,
+                        help="Fixed delay added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0,
+                        help="Extra random delay (uniform 0..jitter)")
+    parser.add_argument("--payload-bytes", type=int, default=1024,
+                        help="Padding per example/trace/result record")
+    parser.add_argument("--rows", type=int, default=100,
+                        help="Examples per pulled dataset / results per run")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Print requests to unknown paths")
+    args = parser.parse_args()
+
+    print(f"Fake Judgment API on http://127.0.0.1:{args.port}",
+          file=sys.stderr)
+    try:
+        serve(args.port, args.latency_ms, args.jitter_ms, args.payload_bytes,
+              args.rows, args.verbose)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,28 @@ Judgeval MCP Server - DXT Version
 =================================
 """
 
+import atexit
+import csv
+import hashlib
 import json
+import logging
+import logging.handlers
+import queue
+import random
+import re
+import sqlite3
 import sys
 import os
+import threading
+import time
+import urllib.parse
+import uuid
+import zlib
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from datetime import date, datetime, time as dt_time
+from decimal import Decimal
 
 # Debug için path bilgilerini logla
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -20,16 +39,116 @@ if lib_path not in sys.path:
 if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 
-# Debug log
-def debug_log(message):
-    with open(os.path.join(current_dir, 'debug.log'), 'a') as f:
-        f.write(f"{message}\n")
+# .env dosyasını ayarlar okunmadan önce yükle
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+    DOTENV_LOADED = True
+except ImportError:
+    DOTENV_LOADED = False
+
+logger = logging.getLogger("judgeval_mcp")
+
+
+def debug_log(message, level=logging.DEBUG, **fields):
+    """Queue a log record; the file write happens on the listener thread
+
+    Extra keyword fields (request_id, tool, latency_ms, ...) are kept as
+    record attributes and emitted as JSON keys when JSON logging is on.
+    """
+    logger.log(level, message, extra=fields)
+
+
+def env_int(name, default):
+    """Read a positive integer setting from the environment"""
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        debug_log(f"Invalid value for {name}, using {default}", 
+                  logging.WARNING)
+        return default
+
+
+def env_float(name, default):
+    """Read a non-negative float setting (e.g. seconds) from the environment"""
+    try:
+        return max(0.0, float(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        debug_log(f"Invalid value for {name}, using {default}", 
+                  logging.WARNING)
+        return default
+
+
+# debug_log'a keyword olarak verilebilen yapısal alanlar
+LOG_FIELDS = ("request_id", "tool", "latency_ms", "status")
+
+
+class LogFormatter(logging.Formatter):
+    """Plain text or JSON-lines formatter that includes structured fields"""
+
+    def __init__(self, json_lines):
+        super().__init__("%(asctime)s %(levelname)s %(message)s")
+        self.json_lines = json_lines
+
+    def format(self, record):
+        fields = {
+            field: getattr(record, field) 
+            for field in LOG_FIELDS if hasattr(record, field)
+        }
+        if self.json_lines:
+            entry = {
+                "ts": self.formatTime(record),
+                "level": record.levelname,
+                "message": record.getMessage(),
+            }
+            entry.update(fields)
+            return json.dumps(entry, default=str)
+        line = super().format(record)
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        return line
+
+
+def setup_logging():
+    """Route debug_log through a queue to a size-rotated log file
+
+    Callers only enqueue records; a QueueListener thread formats and writes
+    them, so no request path ever blocks on file I/O for logging.
+    """
+    log_path = os.getenv(
+        "JUDGMENT_MCP_LOG_PATH", os.path.join(current_dir, 'debug.log')
+    )
+    level_name = os.getenv("JUDGMENT_MCP_LOG_LEVEL", "INFO").upper()
+    logger.setLevel(getattr(logging, level_name, logging.INFO))
+    logger.propagate = False
+    
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_path,
+        maxBytes=env_int("JUDGMENT_MCP_LOG_MAX_BYTES", 5 * 1024 * 1024),
+        backupCount=env_int("JUDGMENT_MCP_LOG_BACKUP_COUNT", 3),
+        encoding="utf-8",
+        delay=True
+    )
+    file_handler.setFormatter(LogFormatter(
+        os.getenv("JUDGMENT_MCP_LOG_JSON", "0") == "1"
+    ))
+    
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    listener.start()
+    # Çıkışta kuyruktaki kayıtları diske yaz
+    atexit.register(listener.stop)
 
 
+setup_logging()
+
 debug_log(f"Current dir: {current_dir}")
 debug_log(f"Lib path: {lib_path}")
 debug_log(f"Lib exists: {os.path.exists(lib_path)}")
 debug_log(f"Python path: {sys.path}")
+if not DOTENV_LOADED:
+    debug_log("python-dotenv not installed, skipping .env")
 
 # Environment variables kontrolü
 JUDGMENT_API_KEY = os.getenv('JUDGMENT_API_KEY')
@@ -38,39 +157,464 @@ debug_log(f"API Key exists: {bool(JUDGMENT_API_KEY)}")
 # API key kontrolü - artık hemen çıkmayacak, main() fonksiyonunda kontrol edilecek
 
 
-# Suppress all stdout output from imports
-class SuppressStdout:
-    def __enter__(self):
-        self._original_stdout = sys.stdout
-        sys.stdout = open(os.devnull, 'w')
-        return self
+# Hızlı JSON codec: orjson kuruluysa onu, değilse stdlib json'u kullan
+JSON_CODEC = os.getenv("JUDGMENT_MCP_JSON_CODEC", "auto").lower()
+orjson = None
+if JSON_CODEC != "stdlib":
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+
+
+def json_default(obj):
+    """Serialize judgeval/pydantic models, datetimes and UUIDs natively
+
+    Replaces ``default=str`` so models come out as objects instead of their
+    lossy repr strings.
+    """
+    model_dump = getattr(obj, "model_dump", None)
+    if callable(model_dump):
+        return model_dump()
+    if hasattr(obj, "__fields__") and callable(getattr(obj, "dict", None)):
+        # pydantic v1
+        return obj.dict()
+    if isinstance(obj, (datetime, date, dt_time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", errors="replace")
+    return str(obj)
+
+
+def encode_json_bytes(obj):
+    """Serialize to compact UTF-8 JSON bytes"""
+    started = time.perf_counter()
+    try:
+        return _encode_json_bytes(obj)
+    finally:
+        add_phase_time("serialize", started)
+
+
+def _encode_json_bytes(obj):
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                obj, default=json_default, option=orjson.OPT_NON_STR_KEYS
+            )
+        except TypeError:
+            # orjson'un desteklemediği değerler (örn. 64 bit üstü int)
+            pass
+    return json.dumps(
+        obj, default=json_default, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def encode_json(obj):
+    """Serialize to a compact JSON string (tool result text)"""
+    started = time.perf_counter()
+    try:
+        if orjson is not None:
+            return _encode_json_bytes(obj).decode("utf-8")
+        return json.dumps(obj, default=json_default, separators=(",", ":"))
+    finally:
+        add_phase_time("serialize", started)
+
+
+def decode_json(data):
+    """Parse a JSON document from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Tool gecikme histogramlarının üst sınırları (milisaniye)
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 
+                      5000, 10000, 30000, 60000)
+METRIC_PHASES = ("parse", "api", "serialize", "write", "total")
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (not thread-safe on its own)"""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value_ms):
+        index = 0
+        while (index < len(LATENCY_BUCKETS_MS) and 
+               value_ms > LATENCY_BUCKETS_MS[index]):
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value_ms
+        self.max = max(self.max, value_ms)
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of samples"""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                if index < len(LATENCY_BUCKETS_MS):
+                    return min(LATENCY_BUCKETS_MS[index], self.max)
+                return self.max
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": (self.sum / self.count) if self.count else None,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+            "max": self.max if self.count else None,
+        }
+
+
+class RequestTimer:
+    """Phase timings of one tools/call, bound to the worker thread"""
+
+    def __init__(self, tool, parse_ms=0.0):
+        self.tool = tool
+        self.started = time.perf_counter()
+        self.phases = {"parse": parse_ms, "api": 0.0, "serialize": 0.0, 
+                       "write": 0.0}
+        self.response_bytes = 0
+
+
+class ServerMetrics:
+    """Per-tool latency histograms, error and response size counters"""
+
+    def __init__(self):
+        self.started = time.time()
+        self._tools = {}
+        self._lock = threading.Lock()
+
+    def record(self, timer, status):
+        total_ms = (time.perf_counter() - timer.started) * 1000 
+        total_ms += timer.phases["parse"]
+        with self._lock:
+            tool = self._tools.get(timer.tool)
+            if tool is None:
+                tool = self._tools[timer.tool] = {
+                    "calls": 0, 
+                    "errors": 0, 
+                    "cancelled": 0,
+                    "response_bytes": 0,
+                    "latency": {p: Histogram() for p in METRIC_PHASES}
+                }
+            tool["calls"] += 1
+            if status == "error":
+                tool["errors"] += 1
+            elif status == "cancelled":
+                tool["cancelled"] += 1
+            tool["response_bytes"] += timer.response_bytes
+            for phase, value_ms in timer.phases.items():
+                tool["latency"][phase].observe(value_ms)
+            tool["latency"]["total"].observe(total_ms)
+        return total_ms
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                name: {
+                    "calls": tool["calls"],
+                    "errors": tool["errors"],
+                    "cancelled": tool["cancelled"],
+                    "response_bytes": tool["response_bytes"],
+                    "latency_ms": {
+                        phase: histogram.summary() 
+                        for phase, histogram in tool["latency"].items()
+                    }
+                }
+                for name, tool in self._tools.items()
+            }
+
+    def prometheus_text(self):
+        """Render the metrics in the Prometheus text exposition format"""
+        lines = [
+            "# HELP judgeval_mcp_tool_calls_total Tool calls handled",
+            "# TYPE judgeval_mcp_tool_calls_total counter",
+            "# HELP judgeval_mcp_tool_errors_total Tool calls that failed",
+            "# TYPE judgeval_mcp_tool_errors_total counter",
+            "# HELP judgeval_mcp_tool_cancelled_total Tool calls cancelled "
+            "by the client",
+            "# TYPE judgeval_mcp_tool_cancelled_total counter",
+            "# HELP judgeval_mcp_tool_response_bytes_total Bytes written "
+            "in tool responses",
+            "# TYPE judgeval_mcp_tool_response_bytes_total counter",
+            "# HELP judgeval_mcp_tool_phase_milliseconds Tool latency "
+            "per phase",
+            "# TYPE judgeval_mcp_tool_phase_milliseconds histogram",
+        ]
+        with self._lock:
+            for name, tool in sorted(self._tools.items()):
+                label = f'tool="{name}"'
+                lines.append(
+                    f"judgeval_mcp_tool_calls_total{{{label}}} {tool['calls']}"
+                )
+                lines.append(
+                    f"judgeval_mcp_tool_errors_total{{{label}}} "
+                    f"{tool['errors']}"
+                )
+                lines.append(
+                    f"judgeval_mcp_tool_cancelled_total{{{label}}} "
+                    f"{tool['cancelled']}"
+                )
+                lines.append(
+                    f"judgeval_mcp_tool_response_bytes_total{{{label}}} "
+                    f"{tool['response_bytes']}"
+                )
+                for phase, histogram in tool["latency"].items():
+                    labels = f'{label},phase="{phase}"'
+                    cumulative = 0
+                    for bound, bucket_count in zip(
+                        LATENCY_BUCKETS_MS + ("+Inf",), histogram.counts
+                    ):
+                        cumulative += bucket_count
+                        lines.append(
+                            "judgeval_mcp_tool_phase_milliseconds_bucket"
+                            f'{{{labels},le="{bound}"}} {cumulative}'
+                        )
+                    lines.append(
+                        "judgeval_mcp_tool_phase_milliseconds_sum"
+                        f"{{{labels}}} {histogram.sum:.3f}"
+                    )
+                    lines.append(
+                        "judgeval_mcp_tool_phase_milliseconds_count"
+                        f"{{{labels}}} {histogram.count}"
+                    )
+        return "\n".join(lines) + "\n"
+
+
+server_metrics = ServerMetrics()
+_request_local = threading.local()
+
+
+def current_timer():
+    return getattr(_request_local, "timer", None)
+
+
+def add_phase_time(phase, started):
+    """Charge the time since `started` (perf_counter) to the bound request"""
+    timer = current_timer()
+    if timer is not None:
+        timer.phases[phase] += (time.perf_counter() - started) * 1000
+
+
+def metrics_dump_loop(path, interval):
+    """Periodically write Prometheus text metrics to a file (atomically)"""
+    while True:
+        time.sleep(interval)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(server_metrics.prometheus_text())
+            os.replace(tmp_path, path)
+        except Exception as e:
+            debug_log(f"Metrics dump failed: {str(e)}", logging.WARNING)
+
+
+# Aynı anda çalışabilecek tools/call sayısı
+MAX_CONCURRENCY = env_int("JUDGMENT_MCP_MAX_CONCURRENCY", 8)
+
+
+# JSON-RPC çerçeveleri için ayrılan stdout yazıcısının buffer boyutu
+WRITE_BUFFER_SIZE = env_int("JUDGMENT_MCP_WRITE_BUFFER_SIZE", 64 * 1024)
+
+
+def protect_stdout():
+    """Reserve the real stdout for JSON-RPC frames for the whole process
+
+    The original fd 1 is duplicated into a private binary writer and fd 1
+    itself (plus sys.stdout) is pointed at stderr. Anything judgeval, its
+    dependencies or C extensions print ends up in the host's stderr log
+    instead of corrupting the protocol stream, with no per-request
+    redirection.
+    """
+    sys.stdout.flush()
+    protocol_fd = os.dup(sys.stdout.fileno())
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+    return os.fdopen(protocol_fd, "wb", buffering=WRITE_BUFFER_SIZE)
+
+
+# judgeval import'u ve client kurulumu yavaş; ilk tools/call'a (veya
+# arka plandaki warm-up thread'ine) kadar ertelenir
+JudgmentClient = None
+Example = None
+Trace = None
+client = None
+_client_lock = threading.Lock()
+
+
+class JudgevalUnavailable(Exception):
+    """judgeval could not be imported or the client could not be built"""
+
+
+def import_judgeval():
+    """Import the judgeval classes used by the tools (once per process)"""
+    global JudgmentClient, Example, Trace
+    if Trace is not None:
+        return
+    with _client_lock:
+        if Trace is not None:
+            return
+        try:
+            from judgeval.judgment_client import JudgmentClient as jc
+            from judgeval.data.example import Example as example_cls
+            from judgeval.data.trace import Trace as trace_cls
+        except Exception as e:
+            debug_log(f"Import error: {str(e)}", logging.ERROR)
+            raise JudgevalUnavailable(f"Import error: {str(e)}")
+        JudgmentClient, Example = jc, example_cls
+        Trace = trace_cls
+        debug_log("Imports successful", logging.INFO)
+
+
+# Paylaşılan keep-alive HTTP oturumu ayarları
+HTTP_POOL_ENABLED = os.getenv("JUDGMENT_MCP_HTTP_POOL", "1") != "0"
+HTTP_IDLE_TIMEOUT = env_float("JUDGMENT_MCP_HTTP_IDLE_TIMEOUT", 60)
+HTTP_METHODS = ("request", "get", "post", "put", "patch", "delete", 
+                "head", "options")
+
+
+class PooledRequests:
+    """Drop-in for the ``requests`` module backed by one pooled Session
+
+    judgeval calls module-level ``requests.post(...)`` and friends, which
+    open a fresh connection (and TLS handshake) per call. Replacing the
+    module reference with this object routes those calls through a shared
+    keep-alive connection pool while everything else (exceptions, status
+    codes, ...) still resolves to the real module. Pooled connections
+    left idle longer than the idle timeout are dropped before the next
+    request instead of being reused half-closed.
+    """
+
+    def __init__(self, requests_module, session, idle_timeout):
+        self._requests = requests_module
+        self.session = session
+        self._idle_timeout = idle_timeout
+        self._last_used = time.monotonic()
+        self._lock = threading.Lock()
+        for method in HTTP_METHODS:
+            setattr(self, method, self._bind(method))
+
+    def __getattr__(self, name):
+        return getattr(self._requests, name)
+
+    def _bind(self, method):
+        session_method = getattr(self.session, method)
+
+        def call(*args, **kwargs):
+            self._expire_idle()
+            return session_method(*args, **kwargs)
+        return call
+
+    def _expire_idle(self):
+        with self._lock:
+            now = time.monotonic()
+            if (self._idle_timeout and 
+                    now - self._last_used > self._idle_timeout):
+                # Pool'u boşalt; bağlantılar ilk istekte yeniden açılır
+                self.session.close()
+            self._last_used = now
+
+
+def build_http_session(pool_size=None):
+    """Create the keep-alive Session shared by every tool execution"""
+    import requests
+    from requests.adapters import HTTPAdapter
     
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        sys.stdout.close()
-        sys.stdout = self._original_stdout
+    if pool_size is None:
+        # Dispatcher + toplu işlemler aynı anda bağlantı isteyebilir
+        pool_size = env_int(
+            "JUDGMENT_MCP_HTTP_POOL_SIZE", MAX_CONCURRENCY + BULK_MAX_WORKERS
+        )
+    session = requests.Session()
+    # Retry'lar call_api'de; adapter kendi başına tekrar denemesin
+    adapter = HTTPAdapter(
+        pool_connections=env_int("JUDGMENT_MCP_HTTP_POOL_HOSTS", 4),
+        pool_maxsize=pool_size,
+        max_retries=0
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    if os.getenv("JUDGMENT_MCP_HTTP2", "0") == "1":
+        debug_log("HTTP/2 requested but the requests transport used by "
+                  "judgeval only speaks HTTP/1.1; using keep-alive HTTP/1.1",
+                  logging.WARNING)
+    return session
 
 
-# Import with suppressed stdout
-try:
-    with SuppressStdout():
-        from dotenv import load_dotenv
-        load_dotenv()
-        
-        from judgeval.judgment_client import JudgmentClient
-        from judgeval.data.example import Example
-        from judgeval.data.trace import Trace
-        
-        client = JudgmentClient()
-    debug_log("Imports successful")
+def install_http_session():
+    """Point judgeval's HTTP calls at one shared pooled session"""
+    import requests
     
-except Exception as e:
-    debug_log(f"Import error: {str(e)}")
-    print(json.dumps({
-        "jsonrpc": "2.0",
-        "id": None,
-        "error": {"code": -32001, "message": f"Import error: {str(e)}"}
-    }, default=str))
-    sys.exit(1)
+    pooled = PooledRequests(requests, build_http_session(), HTTP_IDLE_TIMEOUT)
+    patched = 0
+    for module_name, module in list(sys.modules.items()):
+        if module is None or not module_name.startswith("judgeval"):
+            continue
+        if getattr(module, "requests", None) is requests:
+            module.requests = pooled
+            patched += 1
+        # "from requests import post" gibi doğrudan importlar
+        for method in HTTP_METHODS:
+            if getattr(module, method, None) is getattr(requests, method):
+                setattr(module, method, getattr(pooled, method))
+                patched += 1
+    debug_log(f"Pooled HTTP session installed in {patched} judgeval names", 
+              logging.INFO)
+    return pooled
+
+
+def get_client():
+    """Return the shared JudgmentClient, building it on first use"""
+    global client
+    if client is not None:
+        return client
+    import_judgeval()
+    with _client_lock:
+        if client is None:
+            try:
+                if HTTP_POOL_ENABLED:
+                    try:
+                        install_http_session()
+                    except Exception as e:
+                        # Pool olmadan da çalışır, sadece daha yavaş
+                        debug_log(f"HTTP pool not installed: {str(e)}", 
+                                  logging.WARNING)
+                client = JudgmentClient()
+            except Exception as e:
+                debug_log(f"Client creation error: {str(e)}", 
+                          logging.ERROR)
+                raise JudgevalUnavailable(
+                    f"Client creation error: {str(e)}"
+                )
+    return client
+
+
+def warm_up_client():
+    """Build the client in the background so the first tool call is fast"""
+    try:
+        get_client()
+    except JudgevalUnavailable:
+        # Hata ilk tools/call'da kullanıcıya döndürülecek
+        pass
 
 
 def get_tools():
@@ -104,6 +648,68 @@ def get_tools():
                 "required": ["trace_id"]
             }
         },
+        {
+            "name": "get_traces",
+            "description": ("Fetch many traces by ID in parallel; results "
+                           "come back in chunks with per-ID errors"),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "trace_ids": {
+                        "type": "array", 
+                        "items": {"type": "string"}, 
+                        "description": "IDs of the traces to fetch"
+                    },
+                    "max_workers": {
+                        "type": "integer", 
+                        "minimum": 1, 
+                        "description": ("Parallel API calls (capped at "
+                                        f"{BULK_MAX_WORKERS})")
+                    },
+                    "allow_partial": {
+                        "type": "boolean", 
+                        "description": ("Keep going when some IDs fail "
+                                        "(false stops at the first error)"), 
+                        "default": True
+                    },
+                    "chunk_size": {
+                        "type": "integer", 
+                        "minimum": 1, 
+                        "description": "Traces per content chunk", 
+                        "default": BULK_CHUNK_SIZE
+                    }
+                },
+                "required": ["trace_ids"]
+            }
+        },
+        {
+            "name": "delete_traces",
+            "description": ("Delete many traces by ID in parallel with "
+                           "per-ID results"),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "trace_ids": {
+                        "type": "array", 
+                        "items": {"type": "string"}, 
+                        "description": "IDs of the traces to delete"
+                    },
+                    "max_workers": {
+                        "type": "integer", 
+                        "minimum": 1, 
+                        "description": ("Parallel API calls (capped at "
+                                        f"{BULK_MAX_WORKERS})")
+                    },
+                    "allow_partial": {
+                        "type": "boolean", 
+                        "description": ("Keep going when some IDs fail "
+                                        "(false stops at the first error)"), 
+                        "default": True
+                    }
+                },
+                "required": ["trace_ids"]
+            }
+        },
         {
             "name": "run_evaluation",
             "description": "Run an evaluation via the Judgment API",
@@ -114,11 +720,32 @@ def get_tools():
                         "type": "object", 
                         "description": ("Evaluation data matching "
                                         "EvaluationRun.model_dump()")
+                    },
+                    "async": {
+                        "type": "boolean", 
+                        "description": ("Start a background job and return "
+                                        "its job_id immediately; poll it "
+                                        "with get_evaluation_status"), 
+                        "default": False
                     }
                 },
                 "required": ["evaluation_data"]
             }
         },
+        {
+            "name": "get_evaluation_status",
+            "description": ("Show the state of a background run_evaluation "
+                           "job (or of all jobs when job_id is omitted)"),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "job_id": {
+                        "type": "string", 
+                        "description": "Job id returned by run_evaluation"
+                    }
+                }
+            }
+        },
         {
             "name": "get_evaluation_results",
             "description": ("Fetch evaluation results for a project and "
@@ -138,9 +765,49 @@ def get_tools():
                 "required": ["project_name", "eval_name"]
             }
         },
+        {
+            "name": "summarize_evaluation_results",
+            "description": ("Per-scorer pass rates, score mean/percentiles/"
+                           "histogram and failing example IDs of an "
+                           "evaluation run, optionally compared to another "
+                           "run"),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "project_name": {
+                        "type": "string", 
+                        "description": "Project name"
+                    },
+                    "eval_name": {
+                        "type": "string", 
+                        "description": "Evaluation run name"
+                    },
+                    "compare_eval_name": {
+                        "type": "string", 
+                        "description": ("Second run to compare against "
+                                        "eval_name (deltas are compare "
+                                        "minus eval_name)")
+                    },
+                    "bins": {
+                        "type": "integer", 
+                        "minimum": 1, 
+                        "description": "Score histogram bins", 
+                        "default": 10
+                    },
+                    "max_failing_ids": {
+                        "type": "integer", 
+                        "minimum": 0, 
+                        "description": "Failing example IDs to list per run", 
+                        "default": 100
+                    }
+                },
+                "required": ["project_name", "eval_name"]
+            }
+        },
         {
             "name": "get_dataset",
-            "description": "Pull a dataset by alias and project",
+            "description": ("Pull a dataset by alias and project, one page "
+                           "of examples and traces at a time"),
             "inputSchema": {
                 "type": "object",
                 "properties": {
@@ -151,6 +818,26 @@ def get_tools():
                     "project_name": {
                         "type": "string", 
                         "description": "Project name"
+                    },
+                    "offset": {
+                        "type": "integer", 
+                        "minimum": 0, 
+                        "description": ("Index of the first example/trace "
+                                        "to return (use next_offset from "
+                                        "the previous page)"), 
+                        "default": 0
+                    },
+                    "limit": {
+                        "type": "integer", 
+                        "minimum": 1, 
+                        "description": ("Maximum examples/traces per page "
+                                        f"(default {DATASET_PAGE_SIZE})")
+                    },
+                    "fields": {
+                        "type": "array", 
+                        "items": {"type": "string"}, 
+                        "description": ("Only return these fields, e.g. "
+                                        "[\"example_id\", \"input\"]")
                     }
                 },
                 "required": ["alias", "project_name"]
@@ -190,11 +877,108 @@ def get_tools():
                         "type": "boolean", 
                         "description": "Append to existing dataset", 
                         "default": False
+                    },
+                    "deduplicate": {
+                        "type": "boolean", 
+                        "description": ("Skip examples whose input/"
+                                       "expected_output/context already "
+                                       "exist in the dataset"), 
+                        "default": True
                     }
                 },
                 "required": ["alias", "project_name", "examples"]
             }
         },
+        {
+            "name": "push_dataset_from_file",
+            "description": ("Stream examples from a local JSONL or CSV file "
+                           "into a dataset, uploading in fixed-size chunks"),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "alias": {
+                        "type": "string", 
+                        "description": "Dataset alias"
+                    },
+                    "project_name": {
+                        "type": "string", 
+                        "description": "Project name"
+                    },
+                    "path": {
+                        "type": "string", 
+                        "description": ("Local path of a .jsonl or .csv file "
+                                        "with one example per row")
+                    },
+                    "format": {
+                        "type": "string", 
+                        "enum": ["jsonl", "csv"], 
+                        "description": ("File format (detected from the "
+                                        "extension when omitted)")
+                    },
+                    "chunk_size": {
+                        "type": "integer", 
+                        "minimum": 1, 
+                        "description": "Examples uploaded per request", 
+                        "default": APPEND_BATCH_SIZE
+                    },
+                    "overwrite": {
+                        "type": "boolean", 
+                        "description": ("Replace the existing dataset instead "
+                                        "of appending to it"), 
+                        "default": False
+                    },
+                    "skip_invalid": {
+                        "type": "boolean", 
+                        "description": ("Skip rows that cannot be converted "
+                                        "instead of stopping"), 
+                        "default": False
+                    }
+                },
+                "required": ["alias", "project_name", "path"]
+            }
+        },
+        {
+            "name": "export_dataset",
+            "description": ("Write a dataset's examples and traces to a local "
+                           "JSONL or Parquet file and return only the path "
+                           "and counts"),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "alias": {
+                        "type": "string", 
+                        "description": "Dataset alias"
+                    },
+                    "project_name": {
+                        "type": "string", 
+                        "description": "Project name"
+                    },
+                    "path": {
+                        "type": "string", 
+                        "description": ("Output file for the examples; traces "
+                                        "go to <name>.traces<ext> next to it")
+                    },
+                    "format": {
+                        "type": "string", 
+                        "enum": ["jsonl", "parquet"], 
+                        "description": ("Output format (detected from the "
+                                        "extension when omitted; parquet "
+                                        "needs pyarrow)")
+                    },
+                    "include_traces": {
+                        "type": "boolean", 
+                        "description": "Also export the dataset's traces", 
+                        "default": True
+                    },
+                    "overwrite": {
+                        "type": "boolean", 
+                        "description": "Replace existing output files", 
+                        "default": False
+                    }
+                },
+                "required": ["alias", "project_name", "path"]
+            }
+        },
         {
             "name": "delete_dataset",
             "description": "Delete a dataset by alias and project",
@@ -241,591 +1025,3932 @@ def get_tools():
                 },
                 "required": ["project_name"]
             }
-        }
-    ]
-
-
-def create_project_if_not_exists(project_name):
-    """Helper function to create project if it doesn't exist"""
-    try:
-        client.create_project(project_name)
-        return {"status": "created", "project_name": project_name}
-    except Exception as e:
-        error_str = str(e)
-        if "already exists" in error_str.lower() or "400" in error_str:
-            return {"status": "already_exists", "project_name": project_name}
-        elif ("500" in error_str or 
-              "internal server error" in error_str.lower()):
-            return {
-                "status": "api_error", 
-                "project_name": project_name, 
-                "error": "HTTP 500: API server error"
-            }
-        else:
-            raise e
-
-
-def execute_tool(name, arguments):
-    """Execute a tool by name with given arguments"""
-    # Suppress stdout during tool execution
-    original_stdout = sys.stdout
-    sys.stdout = open(os.devnull, 'w')
-    
-    try:
-        if name == "get_trace":
-            result = client.api_client.fetch_trace(arguments["trace_id"])
+        },
+        {
+            "name": "cache_stats",
+            "description": ("Show response cache hit/miss counters and "
+                           "memory usage"),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "clear": {
+                        "type": "boolean", 
+                        "description": ("Drop all cached entries, including "
+                                       "the disk cache"), 
+                        "default": False
+                    }
+                }
+            }
+        },
+        {
+            "name": "server_stats",
+            "description": ("Show per-tool latency histograms (parse, API, "
+                           "serialize, write), error counts and response "
+                           "sizes"),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "format": {
+                        "type": "string", 
+                        "enum": ["json", "prometheus"], 
+                        "description": "Output format", 
+                        "default": "json"
+                    }
+                }
+            }
+        },
+        {
+            "name": "api_stats",
+            "description": ("Show Judgment API call, retry and timeout "
+                           "counters and the circuit breaker state"),
+            "inputSchema": {
+                "type": "object",
+                "properties": {}
+            }
+        }
+    ]
+
+
+# Judgment API çağrıları için retry / timeout / circuit breaker ayarları
+API_TIMEOUT = env_float("JUDGMENT_MCP_API_TIMEOUT", 60)
+API_MAX_ATTEMPTS = env_int("JUDGMENT_MCP_API_MAX_ATTEMPTS", 3)
+API_BACKOFF_BASE = env_float("JUDGMENT_MCP_API_BACKOFF_BASE", 0.5)
+API_BACKOFF_MAX = env_float("JUDGMENT_MCP_API_BACKOFF_MAX", 8)
+
+# Tool başına politika: idempotent olmayan çağrılar asla tekrarlanmaz
+RETRY_POLICIES = {
+    "get_trace": {"idempotent": True},
+    "get_traces": {"idempotent": True},
+    "delete_trace": {"idempotent": True},
+    "delete_traces": {"idempotent": True},
+    "get_evaluation_results": {"idempotent": True},
+    "summarize_evaluation_results": {"idempotent": True},
+    "get_dataset": {"idempotent": True},
+    "export_dataset": {"idempotent": True},
+    "delete_dataset": {"idempotent": True},
+    "create_project": {"idempotent": True},
+    "delete_project": {"idempotent": True},
+    "push_dataset": {"idempotent": False},
+    "push_dataset_from_file": {"idempotent": False},
+    "run_evaluation": {
+        "idempotent": False, 
+        "timeout": env_float("JUDGMENT_MCP_EVAL_TIMEOUT", 600)
+    },
+}
+DEFAULT_RETRY_POLICY = {"idempotent": False}
+
+# Geçici hata sayılan HTTP durumları ve exception sınıfları
+TRANSIENT_STATUS_RE = re.compile(
+    r"\b(408|429|500|502|503|504)\b|internal server error|"
+    r"service unavailable|bad gateway|gateway timeout|too many requests",
+    re.IGNORECASE
+)
+# Dataset'in hiç olmadığını söyleyen hatalar (append -> ilk push'a düşülür)
+NOT_FOUND_RE = re.compile(
+    r"\b404\b|not found|does not exist|doesn't exist|no such dataset",
+    re.IGNORECASE
+)
+TRANSIENT_ERROR_NAMES = {
+    "ConnectionError", "ConnectTimeout", "ReadTimeout", "Timeout", 
+    "TimeoutError", "ChunkedEncodingError", "RemoteDisconnected", 
+    "ConnectionResetError", "ApiTimeoutError",
+}
+
+
+class ApiTimeoutError(Exception):
+    """A Judgment API call did not finish within its timeout"""
+
+
+class CircuitOpenError(Exception):
+    """The circuit breaker is open; the call was not attempted"""
+
+
+def is_transient_error(error):
+    """Whether an API failure is worth retrying (network, timeout, 5xx, 429)"""
+    if isinstance(error, CircuitOpenError):
+        return False
+    names = {cls.__name__ for cls in type(error).__mro__}
+    if names & TRANSIENT_ERROR_NAMES:
+        return True
+    return bool(TRANSIENT_STATUS_RE.search(str(error)))
+
+
+def is_not_found_error(error):
+    """Whether an API failure says the dataset/resource does not exist"""
+    if isinstance(error, (CircuitOpenError, DeadlineExceeded)):
+        return False
+    if is_transient_error(error):
+        return False
+    return bool(NOT_FOUND_RE.search(str(error)))
+
+
+class CircuitBreaker:
+    """Fails API calls fast after repeated transient failures
+
+    closed -> open after failure_threshold consecutive transient failures;
+    open -> half_open once reset_timeout has passed, letting a single probe
+    through; the probe's outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.times_opened = 0
+        self.rejected_calls = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """Raise CircuitOpenError or admit the call
+
+        Returns True when the call is the single half-open probe.
+        """
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    self.rejected_calls += 1
+                    raise CircuitOpenError(
+                        "Judgment API is unavailable (circuit breaker open "
+                        f"after {self.consecutive_failures} failures); "
+                        "try again later"
+                    )
+                self.state = "half_open"
+            if self.state == "half_open":
+                if self._probe_in_flight:
+                    self.rejected_calls += 1
+                    raise CircuitOpenError(
+                        "Judgment API is recovering (circuit breaker "
+                        "half-open); try again shortly"
+                    )
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def abandon_probe(self):
+        """Let another call probe when the probe ended without an answer"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if (self.state == "half_open" or 
+                    self.consecutive_failures >= self.failure_threshold):
+                if self.state != "open":
+                    self.times_opened += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def stats(self):
+        with self._lock:
+            retry_in = None
+            if self.state == "open":
+                retry_in = max(0.0, self.reset_timeout 
+                               - (time.monotonic() - self.opened_at))
             return {
-                "content": [{
-                    "type": "text", 
-                    "text": json.dumps(result, default=str)
-                }]
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout_seconds": self.reset_timeout,
+                "retry_in_seconds": retry_in,
+                "times_opened": self.times_opened,
+                "rejected_calls": self.rejected_calls,
             }
+
+
+api_breaker = CircuitBreaker(
+    env_int("JUDGMENT_MCP_BREAKER_THRESHOLD", 5),
+    env_float("JUDGMENT_MCP_BREAKER_RESET", 30)
+)
+
+api_call_stats = {"calls": 0, "retries": 0, "failures": 0, "timeouts": 0}
+_api_stats_lock = threading.Lock()
+
+# Timeout'lu çağrılar için ayrı havuz; süresi dolan çağrının thread'i
+# cevap gelene kadar burada kalır, çağıran taraf beklemez
+_api_executor = None
+
+
+def count_api_stat(key):
+    with _api_stats_lock:
+        api_call_stats[key] += 1
+
+
+def get_api_executor():
+    global _api_executor
+    with _api_stats_lock:
+        if _api_executor is None:
+            _api_executor = ThreadPoolExecutor(
+                max_workers=(MAX_CONCURRENCY + BULK_MAX_WORKERS 
+                             + EVAL_JOB_WORKERS),
+                thread_name_prefix="mcp-api"
+            )
+        return _api_executor
+
+
+class RequestCancelled(BaseException):
+    """The client cancelled the request (notifications/cancelled)
+
+    A BaseException so the tools' broad `except Exception` handlers do not
+    turn a cancellation into an error result and keep working.
+    """
+
+
+class DeadlineExceeded(Exception):
+    """A tools/call ran past its deadline"""
+
+
+# İptal/deadline kontrolü için bekleme adımı (saniye)
+CANCEL_POLL_INTERVAL = 0.05
+
+
+class RequestContext:
+    """Cancellation flag and deadline of one tools/call
+
+    Bound to the worker thread (and to bulk threads working for it) so
+    call_api() and the waits around it can give up early.
+    """
+
+    def __init__(self, request_id, tool, deadline_seconds):
+        self.request_id = request_id
+        self.tool = tool
+        self.deadline_seconds = deadline_seconds
+        self.deadline = (time.monotonic() + deadline_seconds 
+                         if deadline_seconds else None)
+        self.cancelled = threading.Event()
+        self.progress_token = None
+
+    def remaining(self):
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def check(self):
+        if self.cancelled.is_set():
+            raise RequestCancelled(f"Request {self.request_id} cancelled")
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise DeadlineExceeded(
+                f"{self.tool} did not finish within its "
+                f"{self.deadline_seconds:g}s deadline"
+            )
+
+    def sleep(self, seconds):
+        """time.sleep() that wakes up on cancellation or the deadline"""
+        remaining = self.remaining()
+        if remaining is not None:
+            seconds = min(seconds, max(0.0, remaining))
+        self.cancelled.wait(seconds)
+        self.check()
+
+
+class InFlightRequests:
+    """tools/call requests that can still be cancelled, by request id"""
+
+    def __init__(self):
+        self._requests = {}
+        self._lock = threading.Lock()
+        self.cancelled = 0
+
+    def add(self, context):
+        with self._lock:
+            self._requests[context.request_id] = context
+
+    def remove(self, context):
+        with self._lock:
+            if self._requests.get(context.request_id) is context:
+                del self._requests[context.request_id]
+
+    def cancel(self, request_id):
+        with self._lock:
+            context = self._requests.pop(request_id, None)
+            if context is not None:
+                self.cancelled += 1
+        if context is None:
+            return False
+        context.cancelled.set()
+        return True
+
+
+in_flight_requests = InFlightRequests()
+
+
+def current_context():
+    return getattr(_request_local, "context", None)
+
+
+def bind_context(fn, context):
+    """Wrap fn so it runs with `context` bound (for pool threads)"""
+    def run(*args):
+        _request_local.context = context
+        try:
+            return fn(*args)
+        finally:
+            _request_local.context = None
+    return run
+
+
+def wait_future(future, timeout=None):
+    """future.result() that honors the bound request's cancel and deadline
+
+    Raises FuturesTimeoutError once `timeout` seconds pass (None waits as
+    long as the request allows).
+    """
+    context = current_context()
+    if context is None:
+        return future.result(timeout=timeout)
+    give_up = time.monotonic() + timeout if timeout else None
+    while True:
+        context.check()
+        step = CANCEL_POLL_INTERVAL
+        if give_up is not None:
+            step = min(step, give_up - time.monotonic())
+        remaining = context.remaining()
+        if remaining is not None:
+            step = min(step, remaining)
+        try:
+            return future.result(timeout=max(0.0, step))
+        except FuturesTimeoutError:
+            if future.done():
+                raise
+            if give_up is not None and time.monotonic() >= give_up:
+                raise
+
+
+def call_with_timeout(fn, args, timeout):
+    if not timeout and current_context() is None:
+        return fn(*args)
+    future = get_api_executor().submit(fn, *args)
+    try:
+        return wait_future(future, timeout)
+    except FuturesTimeoutError:
+        if future.done():
+            raise
+        future.cancel()
+        count_api_stat("timeouts")
+        raise ApiTimeoutError(
+            f"Judgment API call timed out after {timeout:g}s"
+        )
+    except BaseException:
+        # İptal/deadline: çağrı arka planda biter, sonucu atılır
+        future.cancel()
+        raise
+
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff for the given retry number (1-based)"""
+    ceiling = min(API_BACKOFF_MAX, API_BACKOFF_BASE * (2 ** (attempt - 1)))
+    return random.uniform(0, ceiling)
+
+
+def call_api(tool_name, fn, *args):
+    """Run one client/client.api_client call under the tool's retry policy
+
+    Transient failures (network errors, timeouts, 5xx/429) of idempotent
+    tools are retried with jittered exponential backoff; every attempt goes
+    through the shared circuit breaker so an API outage fails fast.
+    """
+    started = time.perf_counter()
+    try:
+        return _call_api(tool_name, fn, *args)
+    finally:
+        add_phase_time("api", started)
+
+
+def _call_api(tool_name, fn, *args):
+    policy = RETRY_POLICIES.get(tool_name, DEFAULT_RETRY_POLICY)
+    attempts = API_MAX_ATTEMPTS if policy["idempotent"] else 1
+    timeout = policy.get("timeout", API_TIMEOUT)
+    
+    context = current_context()
+    
+    for attempt in range(1, attempts + 1):
+        if context is not None:
+            context.check()
+        probe = api_breaker.before_call()
+        count_api_stat("calls")
+        try:
+            result = call_with_timeout(fn, args, timeout)
+        except (DeadlineExceeded, RequestCancelled) as e:
+            # API'nin değil isteğin sonu; breaker'ı etkilemez ama probe
+            # yarım kaldıysa bir sonraki çağrı deneyebilmeli
+            if probe:
+                api_breaker.abandon_probe()
+            if isinstance(e, DeadlineExceeded):
+                count_api_stat("failures")
+            raise
+        except Exception as e:
+            transient = is_transient_error(e)
+            if transient:
+                api_breaker.record_failure()
+            else:
+                # API cevap verdi (örn. 400/404); breaker açısından başarılı
+                api_breaker.record_success()
+            if not transient or attempt == attempts:
+                count_api_stat("failures")
+                raise
+            delay = backoff_delay(attempt)
+            count_api_stat("retries")
+            debug_log(
+                f"Retrying after transient error: {str(e)}", 
+                logging.WARNING, 
+                tool=tool_name
+            )
+            if context is not None:
+                context.sleep(delay)
+            else:
+                time.sleep(delay)
+            continue
+        api_breaker.record_success()
+        return result
+
+
+# Aynı anda gelen özdeş okuma çağrıları tek API çağrısını paylaşır
+SINGLE_FLIGHT_ENABLED = os.getenv("JUDGMENT_MCP_SINGLE_FLIGHT", "1") != "0"
+
+
+class SingleFlight:
+    """Share one in-flight call among concurrent callers with the same key
+
+    The first caller starts the call on a bounded "mcp-flight" pool; every
+    caller, including the first, waits for the shared result or exception
+    under its own cancellation and deadline, so one caller giving up does
+    not fail the others. Nothing is kept after the call finishes, that is
+    the response cache's job. A shared call never waits on another shared
+    call: do() called from a leader runs fn inline, so a full pool cannot
+    deadlock on nested leaders queued behind it.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self.leaders = 0
+        self.coalesced = 0
+
+    def _get_executor(self):
+        # Paylaşılan çağrı API havuzunda bekler; aynı havuza konulsaydı
+        # havuz dolunca kilitlenirdi. Lider iç içe lider başlatmadığından
+        # havuz dolsa da işler sadece sıra bekler.
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=(MAX_CONCURRENCY + BULK_MAX_WORKERS 
+                             + EVAL_JOB_WORKERS),
+                thread_name_prefix="mcp-flight"
+            )
+        return self._executor
+
+    def do(self, key, fn, *args):
+        if getattr(_request_local, "flight_leader", False):
+            # Lider thread'i başka bir lideri beklememeli (kilitlenme)
+            return fn(*args)
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+                self.leaders += 1
+                executor = self._get_executor()
+            else:
+                self.coalesced += 1
+        if leader:
+            executor.submit(self._run, key, call, fn, args)
         
-        elif name == "delete_trace":
-            result = client.api_client.delete_trace(arguments["trace_id"])
+        started = time.perf_counter()
+        try:
+            return wait_future(call)
+        finally:
+            add_phase_time("api", started)
+
+    def _run(self, key, call, fn, args):
+        _request_local.flight_leader = True
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            self._release(key, call)
+            call.set_exception(e)
+            return
+        finally:
+            _request_local.flight_leader = False
+        self._release(key, call)
+        call.set_result(result)
+
+    def _release(self, key, call):
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+    def forget(self):
+        """Make later callers start fresh calls (after a write)
+
+        Callers already waiting still get the in-flight result.
+        """
+        with self._lock:
+            self._calls.clear()
+
+    def stats(self):
+        with self._lock:
             return {
-                "content": [{
-                    "type": "text", 
-                    "text": json.dumps(result, default=str)
-                }]
+                "enabled": SINGLE_FLIGHT_ENABLED,
+                "in_flight": len(self._calls),
+                "leader_calls": self.leaders,
+                "coalesced_calls": self.coalesced
             }
-        
-        elif name == "run_evaluation":
-            result = client.api_client.run_evaluation(
-                arguments["evaluation_data"]
+
+
+read_flight = SingleFlight()
+
+
+def coalesced_call(key, tool_name, fn, *args):
+    """call_api() shared by concurrent callers with the same key"""
+    if not SINGLE_FLIGHT_ENABLED:
+        return call_api(tool_name, fn, *args)
+    return read_flight.do(key, call_api, tool_name, fn, *args)
+
+
+def api_stats():
+    with _api_stats_lock:
+        stats = dict(api_call_stats)
+    stats["circuit_breaker"] = api_breaker.stats()
+    stats["single_flight"] = read_flight.stats()
+    stats["timeout_seconds"] = API_TIMEOUT
+    stats["max_attempts"] = API_MAX_ATTEMPTS
+    return stats
+
+
+class ProjectRegistry:
+    """Projects confirmed to exist on the Judgment API in this process
+
+    Kept current by create_project, push_dataset and delete_project so
+    repeated writes to a known project skip the create_project round trip.
+    """
+
+    def __init__(self):
+        self._names = set()
+        self._lock = threading.Lock()
+        self.skipped_calls = 0
+
+    def __contains__(self, project_name):
+        with self._lock:
+            return project_name in self._names
+
+    def __len__(self):
+        with self._lock:
+            return len(self._names)
+
+    def add(self, project_name):
+        with self._lock:
+            self._names.add(project_name)
+
+    def discard(self, project_name):
+        with self._lock:
+            self._names.discard(project_name)
+
+    def warm(self, project_names):
+        """Register many projects at once, returns how many were new"""
+        names = {n.strip() for n in project_names if n and n.strip()}
+        with self._lock:
+            added = len(names - self._names)
+            self._names.update(names)
+        return added
+
+    def skip(self):
+        with self._lock:
+            self.skipped_calls += 1
+
+
+known_projects = ProjectRegistry()
+# Başlangıçta bilinen projeler (virgülle ayrılmış)
+known_projects.warm(os.getenv("JUDGMENT_MCP_KNOWN_PROJECTS", "").split(","))
+
+
+def create_project_if_not_exists(project_name):
+    """Helper function to create project if it doesn't exist"""
+    if project_name in known_projects:
+        known_projects.skip()
+        return {"status": "already_exists", "project_name": project_name}
+    try:
+        call_api("create_project", client.create_project, project_name)
+        known_projects.add(project_name)
+        return {"status": "created", "project_name": project_name}
+    except Exception as e:
+        error_str = str(e)
+        if "already exists" in error_str.lower() or "400" in error_str:
+            known_projects.add(project_name)
+            return {"status": "already_exists", "project_name": project_name}
+        elif ("500" in error_str or 
+              "internal server error" in error_str.lower()):
+            return {
+                "status": "api_error", 
+                "project_name": project_name, 
+                "error": "HTTP 500: API server error"
+            }
+        else:
+            raise e
+
+
+# Append API'sine tek seferde gönderilen example sayısı
+APPEND_BATCH_SIZE = env_int("JUDGMENT_MCP_APPEND_BATCH_SIZE", 1000)
+
+
+def build_example(ex):
+    """Convert a user supplied example dict into a judgeval Example"""
+    # Judgment Example için doğru alanları kullan
+    example_data = {}
+    
+    # Input alanı
+    if "input" in ex:
+        example_data["input"] = str(ex["input"])
+    elif "question" in ex:
+        example_data["input"] = str(ex["question"])
+    
+    # Expected output alanı  
+    if "expected_output" in ex:
+        example_data["expected_output"] = str(ex["expected_output"])
+    elif "expected" in ex:
+        example_data["expected_output"] = str(ex["expected"])
+    elif "answer" in ex:
+        example_data["expected_output"] = str(ex["answer"])
+    
+    # Opsiyonel alanlar
+    if "actual_output" in ex:
+        example_data["actual_output"] = str(ex["actual_output"])
+    if "context" in ex:
+        example_data["context"] = str(ex["context"])
+    if "name" in ex:
+        example_data["name"] = str(ex["name"])
+    
+    return Example(**example_data)
+
+
+def pull_existing_examples(alias, project_name):
+    """Pull the non-empty examples of a dataset, empty list if it is missing"""
+    existing_examples = []
+    try:
+        existing_dataset = call_api(
+            "get_dataset", client.pull_dataset, alias, project_name
+        )
+        if existing_dataset and hasattr(existing_dataset, 'examples'):
+            for ex in existing_dataset.examples:
+                # Sadece dolu example'ları say
+                if ex.input is not None:
+                    existing_examples.append(ex)
+    except Exception as e:
+        # API erişilemiyorsa dataset'i yok sayıp üzerine yazma
+        if isinstance(e, CircuitOpenError) or is_transient_error(e):
+            raise
+        # Dataset yok, sorun değil
+    return existing_examples
+
+
+def get_append_api():
+    """Return the judgeval call that appends examples, if this version has one"""
+    candidates = [
+        (client, "append_dataset"),
+        (client, "append_example_dataset"),
+        (getattr(client, "eval_dataset_client", None), "append_examples"),
+    ]
+    for owner, attr in candidates:
+        append_api = getattr(owner, attr, None)
+        if callable(append_api):
+            return append_api
+    return None
+
+
+def append_examples(append_api, alias, examples, project_name,
+                    on_batch=None):
+    """Upload only the new examples to an existing dataset in batches
+
+    Returns False when the first batch is rejected because the dataset does
+    not exist yet, so the caller can fall back to a full push; nothing has
+    been written at that point. Any other failure (timeouts, 5xx, an open
+    circuit, other rejections) is raised: the batch may have been applied,
+    and a full push could duplicate or replace rows.
+    on_batch(batch) is called after every accepted batch.
+    """
+    for start in range(0, len(examples), APPEND_BATCH_SIZE):
+        batch = examples[start:start + APPEND_BATCH_SIZE]
+        try:
+            ok = call_api(
+                "push_dataset", append_api, alias, batch, project_name
+            )
+        except Exception as e:
+            if start == 0:
+                if is_not_found_error(e):
+                    debug_log(f"Incremental append rejected: {str(e)}", 
+                              logging.WARNING)
+                    return False
+                raise
+            raise Exception(
+                f"Append failed after {start} of {len(examples)} "
+                f"examples: {str(e)}"
             )
+        if ok is False:
+            if start == 0:
+                return False
+            raise Exception(
+                f"Append failed after {start} of {len(examples)} examples"
+            )
+        if on_batch is not None:
+            on_batch(batch)
+    return True
+
+
+def normalize_field(value):
+    """Whitespace-insensitive text form of an example field for hashing"""
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return "\x1f".join(normalize_field(v) for v in value)
+    return " ".join(str(value).split())
+
+
+def example_fingerprint(ex):
+    """16-byte content hash of an Example's input/expected_output/context"""
+    text = "\x1e".join((
+        normalize_field(getattr(ex, "input", None)),
+        normalize_field(getattr(ex, "expected_output", None)),
+        normalize_field(getattr(ex, "context", None)),
+    ))
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+class DedupIndex:
+    """Content hashes of the examples known to be in each dataset
+
+    Kept in memory per (project, alias) and, when a directory is given,
+    mirrored to one append-only file of hex digests per dataset so the
+    index survives restarts. It is rebuilt whenever push_dataset pulls the
+    dataset, and dropped when the dataset is overwritten from a file or
+    deleted. push_dataset pulls a dataset nobody indexed yet ("cold") once
+    before deduplicating against it.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self._datasets = {}
+        self._lock = threading.Lock()
+        self.deduplicated = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def _name_hash(value):
+        return hashlib.blake2b(
+            str(value).encode("utf-8"), digest_size=8
+        ).hexdigest()
+
+    def _path(self, project_name, alias):
+        return os.path.join(
+            self.directory,
+            f"{self._name_hash(project_name)}-{self._name_hash(alias)}.idx"
+        )
+
+    def _load(self, key):
+        """In-memory set of a dataset, loading it from disk once"""
+        hashes = self._datasets.get(key)
+        if hashes is not None or not self.directory:
+            return hashes
+        try:
+            with open(self._path(*key), encoding="ascii") as f:
+                hashes = {bytes.fromhex(line.strip()) for line in f
+                          if line.strip()}
+        except (OSError, ValueError):
+            return None
+        self._datasets[key] = hashes
+        return hashes
+
+    def has(self, project_name, alias):
+        """Whether the dataset's contents are indexed (in memory or on disk)"""
+        with self._lock:
+            return self._load((project_name, alias)) is not None
+
+    def filter_new(self, project_name, alias, examples):
+        """Drop examples already in the dataset or earlier in the batch
+
+        Returns (examples to upload, number skipped).
+        """
+        with self._lock:
+            known = self._load((project_name, alias)) or set()
+        seen = set()
+        kept = []
+        for ex in examples:
+            fingerprint = example_fingerprint(ex)
+            if fingerprint in known or fingerprint in seen:
+                continue
+            seen.add(fingerprint)
+            kept.append(ex)
+        skipped = len(examples) - len(kept)
+        with self._lock:
+            self.deduplicated += skipped
+        return kept, skipped
+
+    def add(self, project_name, alias, examples):
+        """Record uploaded examples of an already indexed dataset
+
+        A dataset whose existing rows were never hashed stays unindexed;
+        indexing only the new rows would make it look complete and skip
+        the pull that hashes the rest.
+        """
+        key = (project_name, alias)
+        with self._lock:
+            hashes = self._load(key)
+            if hashes is None:
+                return
+            fingerprints = [example_fingerprint(ex) for ex in examples]
+            hashes.update(fingerprints)
+            if self.directory:
+                try:
+                    with open(self._path(*key), "a", encoding="ascii") as f:
+                        f.writelines(fp.hex() + "\n" for fp in fingerprints)
+                except OSError as e:
+                    debug_log(f"Dedup index write failed: {str(e)}",
+                              logging.WARNING)
+
+    def reset(self, project_name, alias, examples):
+        """Replace a dataset's hashes with those of its full contents"""
+        hashes = {example_fingerprint(ex) for ex in examples}
+        key = (project_name, alias)
+        with self._lock:
+            self._datasets[key] = hashes
+            if self.directory:
+                path = self._path(*key)
+                try:
+                    with open(f"{path}.tmp", "w", encoding="ascii") as f:
+                        f.writelines(fp.hex() + "\n" for fp in hashes)
+                    os.replace(f"{path}.tmp", path)
+                except OSError as e:
+                    debug_log(f"Dedup index write failed: {str(e)}",
+                              logging.WARNING)
+
+    def forget(self, project_name, alias=None):
+        """Drop a dataset's hashes (or every dataset of a project)"""
+        with self._lock:
+            for key in [k for k in self._datasets
+                        if k[0] == project_name
+                        and (alias is None or k[1] == alias)]:
+                del self._datasets[key]
+            if not self.directory:
+                return
+            prefix = f"{self._name_hash(project_name)}-"
+            for name in os.listdir(self.directory):
+                if not name.startswith(prefix):
+                    continue
+                if alias is not None and name != os.path.basename(
+                    self._path(project_name, alias)
+                ):
+                    continue
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def stats(self):
+        with self._lock:
             return {
-                "content": [{
-                    "type": "text", 
-                    "text": json.dumps(result, default=str)
-                }]
+                "datasets": len(self._datasets),
+                "hashes": sum(len(h) for h in self._datasets.values()),
+                "deduplicated_examples": self.deduplicated,
+                "persistent": bool(self.directory)
             }
-        
-        elif name == "get_evaluation_results":
-            result = client.api_client.fetch_evaluation_results(
-                arguments["project_name"], 
-                arguments["eval_name"]
+
+
+# push_dataset append'lerinde tekrar eden example'ları atlamak için
+dedup_index = DedupIndex(os.getenv("JUDGMENT_MCP_DEDUP_DIR") or None)
+
+
+class ResponseCache:
+    """Thread-safe LRU cache with per-entry TTL, byte budget and tags
+
+    Entries are tagged with the resources they were built from (a trace, a
+    dataset, a project) so write tools can drop every entry they affect.
+    With keep_oversized a value larger than the budget evicts everything
+    else instead of being refused; with sliding every hit restarts the
+    entry's TTL, so data that is still being paged through stays alive.
+    """
+
+    def __init__(self, max_bytes, keep_oversized=False, sliding=False,
+                 name="response"):
+        self.max_bytes = max_bytes
+        self.keep_oversized = keep_oversized
+        self.sliding = sliding
+        self.name = name
+        self.current_bytes = 0
+        # Her invalidation'da artar; araya yazma girmiş okumalar cache'lenmez
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.oversized = 0
+        self._entries = OrderedDict()
+        self._tags = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return (hit, value) and refresh the entry's LRU position"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] <= time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            if self.sliding:
+                self._entries[key] = (
+                    entry[0], entry[1], time.monotonic() + entry[4],
+                    entry[3], entry[4]
+                )
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, key, value, ttl, size, tags=(), generation=None):
+        """Store a value unless it is too large or went stale while loading"""
+        if size > self.max_bytes and not self.keep_oversized:
+            with self._lock:
+                self.oversized += 1
+            debug_log(
+                f"{size} byte value exceeds the {self.name} cache budget "
+                f"({self.max_bytes} bytes); not cached", 
+                logging.WARNING
+            )
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (
+                value, size, time.monotonic() + ttl, tuple(tags), ttl
             )
+            self.current_bytes += size
+            if size > self.max_bytes:
+                self.oversized += 1
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            # En son eklenen değer bütçeyi aşsa bile kalır (keep_oversized)
+            while (self.current_bytes > self.max_bytes 
+                   and len(self._entries) > 1):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, tag):
+        """Drop every entry built from the given resource tag"""
+        with self._lock:
+            self.generation += 1
+            for key in list(self._tags.get(tag, ())):
+                self._remove(key)
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._tags.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
             return {
-                "content": [{
-                    "type": "text", 
-                    "text": json.dumps(result, default=str)
-                }]
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "oversized": self.oversized,
             }
-        
-        elif name == "get_dataset":
-            try:
-                result = client.pull_dataset(
-                    arguments["alias"], 
-                    arguments["project_name"]
+
+    def _remove(self, key):
+        value, size, expires_at, tags, ttl = self._entries.pop(key)
+        self.current_bytes -= size
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+# Okuma tool'ları için cache süreleri (saniye, 0 = kapalı)
+CACHE_TTLS = {
+    "get_trace": env_float("JUDGMENT_MCP_CACHE_TTL_GET_TRACE", 300),
+    "get_dataset": env_float("JUDGMENT_MCP_CACHE_TTL_GET_DATASET", 60),
+    "get_evaluation_results": env_float(
+        "JUDGMENT_MCP_CACHE_TTL_GET_EVALUATION_RESULTS", 120
+    ),
+}
+
+response_cache = ResponseCache(
+    env_int("JUDGMENT_MCP_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+)
+
+
+# Kalıcı (SQLite) cache: yeniden başlatmalar arasında dataset/trace okumaları
+DISK_CACHE_PATH = os.getenv("JUDGMENT_MCP_DISK_CACHE") or None
+DISK_CACHE_MAX_BYTES = env_int(
+    "JUDGMENT_MCP_DISK_CACHE_MAX_BYTES", 256 * 1024 * 1024
+)
+DISK_CACHE_MAX_AGE = env_float("JUDGMENT_MCP_DISK_CACHE_MAX_AGE", 86400)
+DISK_CACHE_BUSY_TIMEOUT = env_float("JUDGMENT_MCP_DISK_CACHE_BUSY_TIMEOUT", 5)
+# Saklanan payload biçimi değişince eski kayıtlar okunmaz
+DISK_CACHE_FORMAT = 1
+
+
+class DiskCache:
+    """zlib-compressed JSON payloads in a SQLite file shared by processes
+
+    Entries are keyed by (kind, key), e.g. ("dataset", '["project","alias"]')
+    or ("trace", trace_id), and record when they were fetched. Every
+    resource tag has a version row that write tools bump; an entry stores
+    the versions of its tags at fetch time and is only served while they
+    still match, so a write made by any process sharing the file hides
+    older copies, including ones whose fetch was still in flight. The file
+    runs in WAL mode with a busy timeout so several servers can use it at
+    once, and the least recently read entries are evicted past max_bytes.
+    SQLite errors are logged and treated as misses.
+    """
+
+    def __init__(self, path, max_bytes, max_age):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, timeout=DISK_CACHE_BUSY_TIMEOUT,
+                isolation_level=None, check_same_thread=False
+            )
+            conn.execute(
+                f"PRAGMA busy_timeout = {int(DISK_CACHE_BUSY_TIMEOUT * 1000)}"
+            )
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    project TEXT,
+                    payload BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    format INTEGER NOT NULL,
+                    versions TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (kind, key)
+                );
+                CREATE INDEX IF NOT EXISTS entries_accessed
+                    ON entries (accessed_at);
+                CREATE INDEX IF NOT EXISTS entries_project
+                    ON entries (project);
+                CREATE TABLE IF NOT EXISTS versions (
+                    tag TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL
+                );
+            """)
+            self._conn = conn
+        return self._conn
+
+    def _failed(self, action, error):
+        self.errors += 1
+        debug_log(f"Disk cache {action} failed: {str(error)}", logging.WARNING)
+
+    @staticmethod
+    def _tag_name(tag):
+        return json.dumps(list(tag), default=str)
+
+    def _versions(self, conn, tags):
+        names = [self._tag_name(tag) for tag in tags]
+        rows = dict(conn.execute(
+            "SELECT tag, version FROM versions WHERE tag IN "
+            f"({','.join('?' * len(names))})", names
+        ).fetchall())
+        return ",".join(str(rows.get(name, 0)) for name in names)
+
+    def versions(self, tags):
+        """Version marker of the given tags, taken before a fetch"""
+        try:
+            with self._lock:
+                return self._versions(self._connect(), tags)
+        except (sqlite3.Error, OSError) as e:
+            self._failed("version read", e)
+            return None
+
+    def get(self, kind, key, tags):
+        """Return (hit, value) for a fresh entry whose tags are unchanged"""
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT payload, format, versions, fetched_at, "
+                    "accessed_at FROM entries WHERE kind = ? AND key = ?",
+                    (kind, key)
+                ).fetchone()
+                current = self._versions(conn, tags) if row else None
+                now = time.time()
+                if row is not None and (
+                    row[1] != DISK_CACHE_FORMAT or row[2] != current
+                    or (self.max_age and now - row[3] > self.max_age)
+                ):
+                    conn.execute(
+                        "DELETE FROM entries WHERE kind = ? AND key = ?",
+                        (kind, key)
+                    )
+                    row = None
+                if row is None:
+                    self.misses += 1
+                    return False, None
+                # Her okumada yazmamak için erişim zamanı dakikada bir
+                if now - row[4] > 60:
+                    conn.execute(
+                        "UPDATE entries SET accessed_at = ? "
+                        "WHERE kind = ? AND key = ?", (now, kind, key)
+                    )
+                self.hits += 1
+            return True, decode_json(zlib.decompress(row[0]))
+        except (sqlite3.Error, OSError, zlib.error, ValueError) as e:
+            self._failed("read", e)
+            return False, None
+
+    def put(self, kind, key, value, tags, versions, project=None):
+        """Store a value fetched while its tags had the given versions"""
+        if versions is None:
+            return
+        try:
+            payload = zlib.compress(encode_json_bytes(value), 6)
+            if len(payload) > self.max_bytes:
+                return
+            with self._lock:
+                conn = self._connect()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    if self._versions(conn, tags) != versions:
+                        # Fetch sırasında bir yazma araya girdi
+                        conn.execute("COMMIT")
+                        return
+                    now = time.time()
+                    conn.execute(
+                        "INSERT OR REPLACE INTO entries VALUES "
+                        "(?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (kind, key, project, payload, len(payload),
+                         DISK_CACHE_FORMAT, versions, now, now)
+                    )
+                    self.stores += 1
+                    self._evict(conn)
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+        except (sqlite3.Error, OSError, zlib.error) as e:
+            self._failed("write", e)
+
+    def _evict(self, conn):
+        total = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+        while total > self.max_bytes:
+            oldest = conn.execute(
+                "SELECT kind, key, size FROM entries "
+                "ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not oldest:
+                break
+            for kind, key, size in oldest:
+                if total <= self.max_bytes:
+                    break
+                conn.execute(
+                    "DELETE FROM entries WHERE kind = ? AND key = ?",
+                    (kind, key)
                 )
-                # Dataset nesnesini JSON-serializable formata çevir
-                dataset_dict = {
-                    "alias": arguments["alias"],
-                    "project_name": arguments["project_name"],
-                    "examples": [],
-                    "traces": []
-                }
-                
-                if result and hasattr(result, 'examples') and result.examples:
-                    for ex in result.examples:
-                        example_dict = {
-                            "example_id": getattr(ex, 'example_id', None),
-                            "input": getattr(ex, 'input', None),
-                            "expected_output": getattr(
-                                ex, 'expected_output', None
-                            ),
-                            "actual_output": getattr(
-                                ex, 'actual_output', None
-                            ),
-                            "context": getattr(ex, 'context', None),
-                            "name": getattr(ex, 'name', None),
-                            "created_at": str(getattr(ex, 'created_at', None))
-                        }
-                        dataset_dict["examples"].append(example_dict)
-                
-                if result and hasattr(result, 'traces') and result.traces:
-                    for trace in result.traces:
-                        trace_dict = {
-                            "trace_id": getattr(trace, 'trace_id', None),
-                            "input": getattr(trace, 'input', None),
-                            "output": getattr(trace, 'output', None)
-                        }
-                        dataset_dict["traces"].append(trace_dict)
-                
-                return {
-                    "content": [{
-                        "type": "text", 
-                        "text": json.dumps(dataset_dict, default=str)
-                    }]
-                }
-            except Exception as e:
-                return {
-                    "content": [{
-                        "type": "text", 
-                        "text": json.dumps(
-                            {"error": f"Failed to get dataset: {str(e)}"}, 
-                            default=str
+                total -= size
+                self.evictions += 1
+
+    def invalidate(self, tag):
+        """Bump a resource tag's version and drop the entries built from it"""
+        if tag[0] not in ("project", "dataset", "trace"):
+            return
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.execute(
+                        "INSERT INTO versions VALUES (?, 1) ON CONFLICT(tag) "
+                        "DO UPDATE SET version = version + 1",
+                        (self._tag_name(tag),)
+                    )
+                    if tag[0] == "project":
+                        conn.execute(
+                            "DELETE FROM entries WHERE project = ?", (tag[1],)
                         )
-                    }]
-                }
-        
-        elif name == "push_dataset":
+                    elif tag[0] == "dataset":
+                        conn.execute(
+                            "DELETE FROM entries WHERE kind = ? AND key = ?",
+                            ("dataset", dataset_disk_key(tag[1], tag[2]))
+                        )
+                    else:
+                        conn.execute(
+                            "DELETE FROM entries WHERE kind = ? AND key = ?",
+                            ("trace", str(tag[1]))
+                        )
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+        except (sqlite3.Error, OSError) as e:
+            self._failed("invalidation", e)
+
+    def clear(self):
+        try:
+            with self._lock:
+                self._connect().execute("DELETE FROM entries")
+        except (sqlite3.Error, OSError) as e:
+            self._failed("clear", e)
+
+    def stats(self):
+        stats = {
+            "path": self.path,
+            "max_bytes": self.max_bytes,
+            "max_age_seconds": self.max_age,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "errors": self.errors
+        }
+        try:
+            with self._lock:
+                entries, size = self._connect().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+                ).fetchone()
+            stats["entries"] = entries
+            stats["bytes"] = size
+        except (sqlite3.Error, OSError) as e:
+            self._failed("stats", e)
+        return stats
+
+
+def dataset_disk_key(project_name, alias):
+    return json.dumps([project_name, alias])
+
+
+disk_cache = (DiskCache(DISK_CACHE_PATH, DISK_CACHE_MAX_BYTES,
+                        DISK_CACHE_MAX_AGE)
+              if DISK_CACHE_PATH else None)
+
+
+def disk_cached(kind, key, tags, fetch, project=None):
+    """Serve a read from the persistent cache, storing what fetch returns"""
+    if disk_cache is None:
+        return fetch()
+    hit, value = disk_cache.get(kind, key, tags)
+    if hit:
+        return value
+    versions = disk_cache.versions(tags)
+    value = fetch()
+    if value is not None:
+        disk_cache.put(kind, key, value, tags, versions, project)
+    return value
+
+
+def cache_key(name, arguments):
+    return (name, json.dumps(arguments, sort_keys=True, default=str))
+
+
+def response_size(result):
+    """Approximate memory footprint of a tool result in bytes"""
+    return sum(len(item.get("text", "")) for item in result["content"])
+
+
+def cache_tags(name, arguments):
+    """Resources a cached read depends on"""
+    project_name = arguments.get("project_name")
+    if name == "get_trace":
+        return [("trace", arguments.get("trace_id"))]
+    if name == "get_dataset":
+        return [
+            ("dataset", project_name, arguments.get("alias")),
+            ("project", project_name),
+        ]
+    if name == "get_evaluation_results":
+        return [
+            ("evaluation", project_name, arguments.get("eval_name")),
+            ("project", project_name),
+        ]
+    return []
+
+
+def invalidation_tags(name, arguments):
+    """Resources a write tool changes"""
+    project_name = arguments.get("project_name")
+    if name in ("push_dataset", "push_dataset_from_file", "delete_dataset"):
+        return [("dataset", project_name, arguments.get("alias"))]
+    if name == "delete_trace":
+        return [("trace", arguments.get("trace_id"))]
+    if name == "delete_traces":
+        return [("trace", t) for t in arguments.get("trace_ids") or []]
+    if name == "delete_project":
+        return [("project", project_name)]
+    if name == "run_evaluation":
+        data = arguments.get("evaluation_data") or {}
+        if isinstance(data, dict):
+            return [(
+                "evaluation", 
+                data.get("project_name"), 
+                data.get("eval_name")
+            )]
+    return []
+
+
+# get_dataset için varsayılan sayfa boyutu
+DATASET_PAGE_SIZE = env_int("JUDGMENT_MCP_DATASET_PAGE_SIZE", 100)
+
+# Çekilen dataset'in sonraki sayfalar için bellekte tutulma süresi (saniye)
+DATASET_SNAPSHOT_TTL = env_float("JUDGMENT_MCP_DATASET_SNAPSHOT_TTL", 300)
+
+# Sayfalama snapshot'ları response cache'ten ayrı tutulur: büyük bir dataset
+# genel cache bütçesini aşsa da sayfalar arasında yeniden çekilmemeli
+snapshot_cache = ResponseCache(
+    env_int("JUDGMENT_MCP_SNAPSHOT_MAX_BYTES", 512 * 1024 * 1024),
+    keep_oversized=True,
+    sliding=True,
+    name="snapshot"
+)
+
+
+def example_to_dict(ex):
+    """Extract the JSON-serializable fields of a pulled judgeval Example"""
+    return {
+        "example_id": getattr(ex, 'example_id', None),
+        "input": getattr(ex, 'input', None),
+        "expected_output": getattr(ex, 'expected_output', None),
+        "actual_output": getattr(ex, 'actual_output', None),
+        "context": getattr(ex, 'context', None),
+        "name": getattr(ex, 'name', None),
+        "created_at": str(getattr(ex, 'created_at', None))
+    }
+
+
+def trace_to_dict(trace):
+    """Extract the JSON-serializable fields of a pulled judgeval Trace"""
+    return {
+        "trace_id": getattr(trace, 'trace_id', None),
+        "input": getattr(trace, 'input', None),
+        "output": getattr(trace, 'output', None)
+    }
+
+
+def load_dataset_snapshot(alias, project_name):
+    """Pull a dataset once and keep its rows around for paging
+
+    The converted example/trace dicts live in snapshot_cache, which keeps
+    a dataset even past its byte budget and restarts the TTL on every page,
+    under the same dataset/project tags as get_dataset results so write
+    tools invalidate them together. Concurrent misses share one pull.
+    """
+    key = ("dataset_snapshot", project_name, alias)
+    hit, snapshot = snapshot_cache.get(key)
+    if hit:
+        return snapshot
+    if not SINGLE_FLIGHT_ENABLED:
+        return build_dataset_snapshot(alias, project_name)
+    return read_flight.do(key, build_dataset_snapshot, alias, project_name)
+
+
+def build_dataset_snapshot(alias, project_name):
+    key = ("dataset_snapshot", project_name, alias)
+    generation = snapshot_cache.generation
+    
+    snapshot = disk_cached(
+        "dataset", dataset_disk_key(project_name, alias),
+        [("dataset", project_name, alias), ("project", project_name)],
+        lambda: pull_dataset_snapshot(alias, project_name),
+        project=project_name
+    )
+    
+    if DATASET_SNAPSHOT_TTL:
+        snapshot_cache.put(
+            key, snapshot, DATASET_SNAPSHOT_TTL, 
+            estimate_rows_size(snapshot["examples"]) 
+            + estimate_rows_size(snapshot["traces"]),
+            [("dataset", project_name, alias), ("project", project_name)],
+            generation
+        )
+    return snapshot
+
+
+def pull_dataset_snapshot(alias, project_name):
+    """Pull a dataset and convert its rows to plain dicts
+
+    Runs as the snapshot's single-flight leader, so the pull is a plain
+    call_api() rather than a second, nested shared call.
+    """
+    result = call_api("get_dataset", client.pull_dataset, alias, project_name)
+    snapshot = {"examples": [], "traces": []}
+    if result and hasattr(result, 'examples') and result.examples:
+        snapshot["examples"] = [example_to_dict(ex) for ex in result.examples]
+    if result and hasattr(result, 'traces') and result.traces:
+        snapshot["traces"] = [trace_to_dict(t) for t in result.traces]
+    return snapshot
+
+
+def estimate_rows_size(rows):
+    """Cheap byte estimate of a list of flat dicts, without serializing"""
+    size = 0
+    for row in rows:
+        for value in row.values():
+            size += len(value) if isinstance(value, str) else 16
+        size += 32 * len(row)
+    return size
+
+
+def project_rows(rows, fields):
+    """Keep only the requested fields of each row (all fields if None)"""
+    if not fields:
+        return rows
+    return [{f: row[f] for f in fields if f in row} for row in rows]
+
+
+# Toplu trace tool'ları için paralel API çağrısı üst sınırı
+BULK_MAX_WORKERS = env_int("JUDGMENT_MCP_BULK_MAX_WORKERS", 16)
+BULK_CHUNK_SIZE = env_int("JUDGMENT_MCP_BULK_CHUNK_SIZE", 50)
+
+# Toplu çağrılar dispatcher havuzundan ayrı bir havuzda çalışır; aynı
+# havuza iş göndermek worker'lar dolunca kilitlenmeye yol açar
+_bulk_executor = None
+_bulk_executor_lock = threading.Lock()
+
+
+def get_bulk_executor():
+    global _bulk_executor
+    with _bulk_executor_lock:
+        if _bulk_executor is None:
+            _bulk_executor = ThreadPoolExecutor(
+                max_workers=BULK_MAX_WORKERS,
+                thread_name_prefix="mcp-bulk"
+            )
+        return _bulk_executor
+
+
+def fan_out(fn, items, max_workers, stop_on_error=False):
+    """Run fn over items on the bulk pool with at most max_workers in flight
+
+    Returns {item: (result, error)} in input order. With stop_on_error no
+    new calls are started after the first failure; items that never ran
+    are left out of the result. The wall time is charged to the request's
+    api phase (bulk threads have no request timer of their own).
+    """
+    started = time.perf_counter()
+    try:
+        return _fan_out(fn, items, max_workers, stop_on_error)
+    finally:
+        add_phase_time("api", started)
+
+
+def _fan_out(fn, items, max_workers, stop_on_error):
+    executor = get_bulk_executor()
+    context = current_context()
+    if context is not None:
+        fn = bind_context(fn, context)
+    workers = max(1, min(max_workers, BULK_MAX_WORKERS))
+    pending = {}
+    outcomes = {}
+    queue_items = iter(items)
+    stopped = False
+    
+    def submit_next():
+        for item in queue_items:
+            pending[executor.submit(fn, item)] = item
+            return True
+        return False
+    
+    for _ in range(workers):
+        if not submit_next():
+            break
+    
+    while pending:
+        done, _ = wait(
+            pending, 
+            timeout=CANCEL_POLL_INTERVAL if context is not None else None,
+            return_when=FIRST_COMPLETED
+        )
+        if context is not None:
+            try:
+                context.check()
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+        for future in done:
+            item = pending.pop(future)
             try:
-                # Önce projenin var olduğundan emin ol
-                project_status = create_project_if_not_exists(
-                    arguments["project_name"]
+                outcomes[item] = (future.result(), None)
+            except Exception as e:
+                outcomes[item] = (None, str(e))
+                stopped = stopped or stop_on_error
+            if not stopped:
+                submit_next()
+    
+    return {item: outcomes[item] for item in items if item in outcomes}
+
+
+def unique_ids(ids):
+    """Drop duplicate IDs while keeping their first-seen order"""
+    return list(OrderedDict.fromkeys(ids))
+
+
+def detect_file_format(path, file_format=None):
+    """Resolve 'jsonl' or 'csv' from an explicit format or the extension"""
+    if file_format:
+        file_format = file_format.lower()
+    else:
+        ext = os.path.splitext(path)[1].lower()
+        file_format = {".jsonl": "jsonl", ".ndjson": "jsonl", 
+                       ".csv": "csv"}.get(ext)
+    if file_format not in ("jsonl", "csv"):
+        raise ValueError(
+            f"Unsupported file format for {path}; use .jsonl or .csv"
+        )
+    return file_format
+
+
+def iter_file_rows(path, file_format):
+    """Yield (row_number, dict) from a JSONL or CSV file, one row at a time"""
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if file_format == "csv":
+            for row_number, row in enumerate(csv.DictReader(f), start=1):
+                yield row_number, row
+            return
+        for row_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if line:
+                yield row_number, decode_json(line)
+
+
+def iter_example_chunks(rows, chunk_size, skip_invalid, stats):
+    """Group file rows into lists of Examples, converting lazily"""
+    chunk = []
+    for row_number, row in rows:
+        try:
+            if not isinstance(row, dict):
+                raise ValueError("row is not an object")
+            chunk.append(build_example(row))
+        except Exception as e:
+            if not skip_invalid:
+                raise ValueError(f"Row {row_number}: {str(e)}")
+            stats["skipped_rows"] += 1
+            continue
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def push_dataset_from_file(alias, project_name, path, file_format=None, 
+                           chunk_size=APPEND_BATCH_SIZE, overwrite=False, 
+                           skip_invalid=False):
+    """Stream a local file into a dataset without loading it into memory
+
+    The first chunk creates (or, with overwrite, replaces) the dataset when
+    appending to it is not possible; every other chunk is appended, so at
+    most one chunk of Examples is alive at a time.
+    """
+    path = os.path.expanduser(path)
+    if not os.path.isfile(path):
+        raise ValueError(f"File not found: {path}")
+    file_format = detect_file_format(path, file_format)
+    
+    append_api = get_append_api()
+    if append_api is None:
+        raise ValueError(
+            "The installed judgeval client has no append API; "
+            "upgrade judgeval or use push_dataset"
+        )
+    
+    project_status = create_project_if_not_exists(project_name)
+    stats = {"skipped_rows": 0}
+    uploaded = 0
+    chunks = 0
+    created = False
+    
+    try:
+        for chunk in iter_example_chunks(
+            iter_file_rows(path, file_format), chunk_size, skip_invalid, stats
+        ):
+            if chunks == 0 and overwrite:
+                ds = client.create_dataset()
+                ds.examples = chunk
+                ds.traces = []
+                call_api(
+                    "push_dataset_from_file", client.push_dataset, 
+                    alias, ds, project_name, True
                 )
-                
-                # Mevcut dataset'i kontrol et
-                existing_examples = []
-                try:
-                    existing_dataset = client.pull_dataset(
-                        arguments["alias"], 
-                        arguments["project_name"]
+                created = True
+            elif not append_examples(append_api, alias, chunk, project_name):
+                if chunks:
+                    raise Exception(
+                        f"Append rejected after {uploaded} examples"
+                    )
+                # Dataset yok, ilk chunk ile oluştur; overwrite=False da
+                # dataset'in tamamını yazar, varsa asla üzerine yazma
+                if pull_existing_examples(alias, project_name):
+                    raise Exception(
+                        "Append was rejected but the dataset exists; "
+                        "refusing to replace it"
                     )
-                    if (existing_dataset and 
-                            hasattr(existing_dataset, 'examples')):
-                        for ex in existing_dataset.examples:
-                            # Sadece dolu example'ları say
-                            if ex.input is not None:
-                                existing_examples.append(ex)
-                except Exception:
-                    # Dataset yok, sorun değil
-                    pass
-                
-                # Append mode kontrolü
-                overwrite = arguments.get("overwrite", False) 
-                append_mode = arguments.get("append", False)
-                
-                # Eğer hiçbiri belirtilmemişse ve mevcut data varsa, append yap
-                if not overwrite and not append_mode and existing_examples:
-                    append_mode = True
-                
                 ds = client.create_dataset()
-                
-                # Mevcut example'ları ekle (append mode'da)
-                all_examples = []
-                if append_mode and existing_examples:
-                    all_examples.extend(existing_examples)
-                
-                # Yeni example'ları ekle
-                for ex in arguments["examples"]:
-                    try:
-                        # Judgment Example için doğru alanları kullan
-                        example_data = {}
-                        
-                        # Input alanı
-                        if "input" in ex:
-                            example_data["input"] = str(ex["input"])
-                        elif "question" in ex:
-                            example_data["input"] = str(ex["question"])
-                        
-                        # Expected output alanı  
-                        if "expected_output" in ex:
-                            example_data["expected_output"] = str(
-                                ex["expected_output"]
-                            )
-                        elif "expected" in ex:
-                            example_data["expected_output"] = str(
-                                ex["expected"]
-                            )
-                        elif "answer" in ex:
-                            example_data["expected_output"] = str(
-                                ex["answer"]
-                            )
-                        
-                        # Opsiyonel alanlar
-                        if "actual_output" in ex:
-                            example_data["actual_output"] = str(
-                                ex["actual_output"]
-                            )
-                        if "context" in ex:
-                            example_data["context"] = str(ex["context"])
-                        if "name" in ex:
-                            example_data["name"] = str(ex["name"])
-                        
-                        # Example oluştur
-                        new_example = Example(**example_data)
-                        all_examples.append(new_example)
-                        
-                    except Exception as ex_error:
-                        return {
-                            "content": [{
-                                "type": "text", 
-                                "text": json.dumps({
-                                    "status": "error",
-                                    "error": (f"Failed to create example: "
-                                             f"{str(ex_error)}"),
-                                    "example_data": ex,
-                                    "suggestion": "Check example format"
-                                }, default=str)
-                            }]
-                        }
-                
-                ds.examples = all_examples
-                
-                if "traces" in arguments and arguments["traces"]:
-                    ds.traces = [Trace(**t) for t in arguments["traces"]]
+                ds.examples = chunk
+                ds.traces = []
+                call_api(
+                    "push_dataset_from_file", client.push_dataset, 
+                    alias, ds, project_name, False
+                )
+                created = True
+            uploaded += len(chunk)
+            chunks += 1
+    except Exception as e:
+        if uploaded:
+            raise Exception(
+                f"{str(e)} ({uploaded} examples were already uploaded)"
+            )
+        raise
+    
+    return {
+        "status": "success",
+        "operation": ("overwritten" if overwrite 
+                      else ("created" if created else "appended")),
+        "alias": alias,
+        "project_name": project_name,
+        "path": path,
+        "format": file_format,
+        "uploaded_examples_count": uploaded,
+        "chunks": chunks,
+        "chunk_size": chunk_size,
+        "skipped_rows": stats["skipped_rows"],
+        "project_status": project_status["status"]
+    }
+
+
+# Parquet export'ta bir row group'a yazılan satır sayısı
+EXPORT_ROW_GROUP_SIZE = env_int("JUDGMENT_MCP_EXPORT_ROW_GROUP_SIZE", 10000)
+
+EXAMPLE_COLUMNS = ("example_id", "input", "expected_output", "actual_output", 
+                   "context", "name", "created_at")
+TRACE_COLUMNS = ("trace_id", "input", "output")
+
+
+class JsonlRowWriter:
+    """Append rows to a JSON-lines file as they arrive"""
+
+    def __init__(self, path, columns):
+        self._file = open(path, "wb")
+
+    def write(self, row):
+        self._file.write(encode_json_bytes(row) + b"\n")
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetRowWriter:
+    """Write rows to Parquet one row group at a time (requires pyarrow)
+
+    All columns are nullable strings; non-string values are JSON encoded so
+    nested inputs/outputs survive the round trip.
+    """
+
+    def __init__(self, path, columns):
+        pyarrow = self.load_pyarrow()
+        self._pa = pyarrow
+        self._columns = columns
+        self._schema = pyarrow.schema(
+            [(column, pyarrow.string()) for column in columns]
+        )
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema)
+        self._rows = []
+
+    @staticmethod
+    def load_pyarrow():
+        try:
+            import pyarrow
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            raise ValueError("Parquet export requires pyarrow; "
+                             "install it or use format 'jsonl'")
+        return pyarrow
+
+    def write(self, row):
+        self._rows.append(row)
+        if len(self._rows) >= EXPORT_ROW_GROUP_SIZE:
+            self._flush()
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        data = {
+            column: [self._cell(row.get(column)) for row in self._rows]
+            for column in self._columns
+        }
+        self._writer.write_table(
+            self._pa.Table.from_pydict(data, schema=self._schema)
+        )
+        self._rows = []
+
+    @staticmethod
+    def _cell(value):
+        if value is None or isinstance(value, str):
+            return value
+        return encode_json(value)
+
+
+EXPORT_WRITERS = {"jsonl": JsonlRowWriter, "parquet": ParquetRowWriter}
+
+
+def iter_dataset_rows(alias, project_name):
+    """Yield example and trace dicts without building the full dict lists
+
+    Reuses a cached get_dataset snapshot when one is alive, otherwise pulls
+    the dataset and converts rows one at a time while they are written.
+    """
+    hit, snapshot = snapshot_cache.get(
+        ("dataset_snapshot", project_name, alias)
+    )
+    if hit:
+        return iter(snapshot["examples"]), iter(snapshot["traces"])
+    result = coalesced_call(
+        ("pull_dataset", project_name, alias), 
+        "export_dataset", client.pull_dataset, alias, project_name
+    )
+    examples = getattr(result, 'examples', None) or []
+    traces = getattr(result, 'traces', None) or []
+    return ((example_to_dict(ex) for ex in examples), 
+            (trace_to_dict(t) for t in traces))
+
+
+def write_rows(rows, path, file_format, columns):
+    """Stream rows into path via a temp file; returns the row count"""
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    writer = EXPORT_WRITERS[file_format](tmp_path, columns)
+    count = 0
+    try:
+        for row in rows:
+            writer.write(row)
+            count += 1
+        writer.close()
+        os.replace(tmp_path, path)
+    except BaseException:
+        writer.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return count
+
+
+def export_dataset(alias, project_name, path, file_format=None, 
+                   include_traces=True, overwrite=False):
+    """Export a dataset to local files; only metadata is returned"""
+    path = os.path.abspath(os.path.expanduser(path))
+    base, ext = os.path.splitext(path)
+    if not file_format:
+        file_format = {".jsonl": "jsonl", ".ndjson": "jsonl", 
+                       ".parquet": "parquet"}.get(ext.lower(), "jsonl")
+    if file_format not in EXPORT_WRITERS:
+        raise ValueError(f"Unsupported export format: {file_format}")
+    if file_format == "parquet":
+        # Dataset'i çekmeden önce pyarrow'un kurulu olduğundan emin ol
+        ParquetRowWriter.load_pyarrow()
+    traces_path = f"{base}.traces{ext or '.' + file_format}"
+    
+    targets = [path] + ([traces_path] if include_traces else [])
+    if not overwrite:
+        for target in targets:
+            if os.path.exists(target):
+                raise ValueError(
+                    f"{target} already exists; pass overwrite=true"
+                )
+    
+    examples, traces = iter_dataset_rows(alias, project_name)
+    result = {
+        "status": "success",
+        "alias": alias,
+        "project_name": project_name,
+        "format": file_format,
+        "examples_path": path,
+        "examples_count": write_rows(
+            examples, path, file_format, EXAMPLE_COLUMNS
+        ),
+        "examples_bytes": os.path.getsize(path)
+    }
+    if include_traces:
+        result["traces_path"] = traces_path
+        result["traces_count"] = write_rows(
+            traces, traces_path, file_format, TRACE_COLUMNS
+        )
+        result["traces_bytes"] = os.path.getsize(traces_path)
+    return result
+
+
+# summarize_evaluation_results: numpy kuruluysa vektörel, değilse saf Python
+SUMMARY_ENGINE = os.getenv("JUDGMENT_MCP_SUMMARY_ENGINE", "auto").lower()
+SUMMARY_PERCENTILES = (10, 25, 50, 75, 90, 99)
+_numpy = None
+_numpy_checked = False
+
+
+def load_numpy():
+    """Import NumPy on first use (it is slow to import); None if missing"""
+    global _numpy, _numpy_checked
+    if not _numpy_checked:
+        if SUMMARY_ENGINE != "python":
+            try:
+                import numpy
+                _numpy = numpy
+            except ImportError:
+                _numpy = None
+        _numpy_checked = True
+    return _numpy
+
+
+def as_plain(obj):
+    """pydantic model / object -> dict, leaving plain values alone"""
+    if type(obj) is dict or type(obj) is list:
+        return obj
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    if hasattr(obj, "dict") and not isinstance(obj, dict):
+        return obj.dict()
+    return obj
+
+
+SCORER_KEYS = ("scorers_data", "scorer_data", "scorers")
+
+
+def iter_scoring_rows(payload):
+    """Yield scoring-result dicts from a fetch_evaluation_results payload
+
+    The payload may be a list of results, a dict wrapping them under
+    results/examples, or a list of such dicts.
+    """
+    stack = [payload]
+    while stack:
+        item = as_plain(stack.pop())
+        if isinstance(item, list):
+            # Hızlı yol: satır listesi doğrudan gezilir, yığına atılmaz
+            for row in item:
+                row = as_plain(row)
+                if isinstance(row, dict) and (
+                    "scorers_data" in row or "scorer_data" in row 
+                    or "scorers" in row
+                ):
+                    yield row
                 else:
-                    ds.traces = []
-                
-                result = client.push_dataset(
-                    arguments["alias"], 
-                    ds, 
-                    arguments["project_name"], 
-                    overwrite  # append mode'da overwrite=False
+                    stack.append(row)
+        elif isinstance(item, dict):
+            if any(key in item for key in SCORER_KEYS):
+                yield item
+                continue
+            for key in ("results", "examples", "data"):
+                if isinstance(item.get(key), list):
+                    stack.append(item[key])
+                    break
+
+
+def row_example_id(row):
+    for container in (row, as_plain(row.get("data_object")), 
+                      as_plain(row.get("example"))):
+        if isinstance(container, dict) and container.get("example_id"):
+            return container["example_id"]
+    return None
+
+
+def collect_scores(payload):
+    """One pass over the rows into per-scorer score/pass columns"""
+    rows = 0
+    failing_ids = []
+    scorers = {}
+    nan = float("nan")
+    for row in iter_scoring_rows(payload):
+        rows += 1
+        scorer_list = (row.get("scorers_data") or row.get("scorer_data") 
+                       or row.get("scorers") or ())
+        all_passed = True
+        for scorer in scorer_list:
+            if type(scorer) is not dict:
+                scorer = as_plain(scorer)
+                if not isinstance(scorer, dict):
+                    continue
+            name = scorer.get("name") or scorer.get("score_type") or "unknown"
+            column = scorers.get(name)
+            if column is None:
+                column = scorers[name] = (
+                    [], [], scorer.get("threshold")
                 )
-                
-                operation_type = ("overwritten" if overwrite 
-                                else ("appended" if append_mode 
-                                      else "created"))
-                
-                return {
-                    "content": [{
-                        "type": "text", 
-                        "text": json.dumps({
-                            "status": "success",
-                            "operation": operation_type,
-                            "alias": arguments["alias"],
-                            "project_name": arguments["project_name"],
-                            "new_examples_added": len(arguments["examples"]),
-                            "existing_examples_count": len(existing_examples),
-                            "total_examples_count": len(all_examples),
-                            "project_status": project_status["status"],
-                            "append_mode": append_mode,
-                            "overwrite_mode": overwrite,
-                            "result": bool(result)
-                        }, default=str)
-                    }]
-                }
-                
-            except Exception as e:
-                error_msg = str(e)
+            score = scorer.get("score")
+            # bool skor sayılmaz (type() kontrolü bool'u dışarıda bırakır)
+            column[0].append(
+                float(score) if type(score) in (float, int) else nan
+            )
+            passed = bool(scorer.get("success"))
+            column[1].append(passed)
+            all_passed = all_passed and passed
+        row_passed = row.get("success")
+        if row_passed is None:
+            row_passed = all_passed
+        if not row_passed:
+            failing_ids.append(row_example_id(row))
+    return rows, failing_ids, {
+        name: {"scores": scores, "passed": passed, "threshold": threshold}
+        for name, (scores, passed, threshold) in scorers.items()
+    }
+
+
+def python_percentile(sorted_values, percent):
+    """Linear interpolation, same as numpy.percentile's default"""
+    position = (len(sorted_values) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return (sorted_values[lower] 
+            + (sorted_values[upper] - sorted_values[lower]) * fraction)
+
+
+def python_histogram(values, bins, low, high):
+    counts = [0] * bins
+    width = (high - low) / bins if high > low else 1.0
+    for value in values:
+        index = int((value - low) / width) if high > low else 0
+        counts[min(max(index, 0), bins - 1)] += 1
+    edges = [low + width * i for i in range(bins + 1)]
+    return counts, edges
+
+
+def score_stats(scores, passed, bins, numpy):
+    """Pass/fail counts, mean, min/max, percentiles and histogram"""
+    if numpy is not None:
+        score_array = numpy.asarray(scores, dtype=float)
+        finite = score_array[numpy.isfinite(score_array)]
+        passed_count = int(numpy.count_nonzero(passed))
+    else:
+        finite = sorted(s for s in scores if s == s)
+        passed_count = sum(passed)
+    
+    count = len(passed)
+    stats = {
+        "count": count,
+        "scored": int(len(finite)),
+        "passed": passed_count,
+        "failed": count - passed_count,
+        "pass_rate": passed_count / count if count else None,
+        "mean": None,
+        "min": None,
+        "max": None,
+        "percentiles": {},
+        "histogram": None
+    }
+    if not len(finite):
+        return stats
+    
+    if numpy is not None:
+        low, high = float(finite.min()), float(finite.max())
+        percentiles = numpy.percentile(finite, SUMMARY_PERCENTILES)
+        stats["mean"] = float(finite.mean())
+        stats["percentiles"] = {
+            f"p{p}": float(v) for p, v in zip(SUMMARY_PERCENTILES, percentiles)
+        }
+        counts, edges = numpy.histogram(
+            finite, bins=bins, range=(low, high if high > low else low + 1)
+        )
+        counts, edges = counts.tolist(), edges.tolist()
+    else:
+        low, high = finite[0], finite[-1]
+        stats["mean"] = sum(finite) / len(finite)
+        stats["percentiles"] = {
+            f"p{p}": python_percentile(finite, p) for p in SUMMARY_PERCENTILES
+        }
+        counts, edges = python_histogram(
+            finite, bins, low, high if high > low else low + 1
+        )
+    stats["min"], stats["max"] = low, high
+    stats["histogram"] = {"edges": edges, "counts": counts}
+    return stats
+
+
+def summarize_results(payload, bins=10, max_failing_ids=100):
+    """Aggregate one evaluation run; returns (summary, failing id set)"""
+    numpy = load_numpy()
+    rows, failing_ids, scorers = collect_scores(payload)
+    summary = {
+        "rows": rows,
+        "failed_rows": len(failing_ids),
+        "pass_rate": (rows - len(failing_ids)) / rows if rows else None,
+        "failing_example_ids": failing_ids[:max_failing_ids],
+        "failing_example_ids_truncated": len(failing_ids) > max_failing_ids,
+        "scorers": {}
+    }
+    for name, column in scorers.items():
+        stats = score_stats(column["scores"], column["passed"], bins, numpy)
+        stats["threshold"] = column["threshold"]
+        summary["scorers"][name] = stats
+    return summary, set(failing_ids)
+
+
+def load_evaluation_results(project_name, eval_name):
+    """Raw results of a run, reusing a cached get_evaluation_results"""
+    arguments = {"project_name": project_name, "eval_name": eval_name}
+    hit, cached = response_cache.get(
+        cache_key("get_evaluation_results", arguments)
+    )
+    if hit:
+        return decode_json(cached["content"][0]["text"])
+    return coalesced_call(
+        ("fetch_evaluation_results", project_name, eval_name),
+        "get_evaluation_results",
+        client.api_client.fetch_evaluation_results,
+        project_name, 
+        eval_name
+    )
+
+
+def compare_summaries(base, other, base_failing, other_failing, 
+                      max_failing_ids):
+    """Per-scorer deltas (other - base) and failing-ID set differences"""
+    scorers = {}
+    for name in sorted(set(base["scorers"]) | set(other["scorers"])):
+        a = base["scorers"].get(name) or {}
+        b = other["scorers"].get(name) or {}
+        scorers[name] = {
+            key: (b[key] - a[key] 
+                  if a.get(key) is not None and b.get(key) is not None 
+                  else None)
+            for key in ("pass_rate", "mean")
+        }
+        scorers[name]["p50"] = None
+        if a.get("percentiles") and b.get("percentiles"):
+            scorers[name]["p50"] = (b["percentiles"]["p50"] 
+                                    - a["percentiles"]["p50"])
+    newly_failing = sorted(map(str, other_failing - base_failing))
+    fixed = sorted(map(str, base_failing - other_failing))
+    return {
+        "pass_rate_delta": (
+            other["pass_rate"] - base["pass_rate"] 
+            if base["pass_rate"] is not None 
+            and other["pass_rate"] is not None else None
+        ),
+        "scorers": scorers,
+        "newly_failing_count": len(newly_failing),
+        "newly_failing_example_ids": newly_failing[:max_failing_ids],
+        "fixed_count": len(fixed),
+        "fixed_example_ids": fixed[:max_failing_ids]
+    }
+
+
+# Aynı anda çalışabilecek asenkron evaluation job sayısı
+EVAL_JOB_WORKERS = env_int("JUDGMENT_MCP_EVAL_JOB_WORKERS", 4)
+
+# Biten job'ların get_evaluation_status için tutulma süresi (saniye)
+EVAL_JOB_RETENTION = env_float("JUDGMENT_MCP_EVAL_JOB_RETENTION", 3600)
+
+# Çalışan job'lar için notifications/progress aralığı (saniye)
+EVAL_PROGRESS_INTERVAL = env_float("JUDGMENT_MCP_EVAL_PROGRESS_INTERVAL", 5)
+
+# Job thread'lerinin bildirim yazdığı writer; main() tarafından atanır
+notification_writer = None
+
+
+def send_notification(method, params):
+    """Write a JSON-RPC notification to the client, if connected"""
+    writer = notification_writer
+    if writer is None:
+        return False
+    return writer.write({"jsonrpc": "2.0", "method": method, "params": params})
+
+
+class EvaluationJobs:
+    """Background run_evaluation jobs, polled with get_evaluation_status
+
+    Each job runs the evaluation on the jobs pool, then fetches its results
+    through fetch_evaluation_results and stores them in the response cache,
+    so a later get_evaluation_results is served without another API call.
+    Clients that pass a progressToken get notifications/progress on every
+    state change and every EVAL_PROGRESS_INTERVAL seconds while it runs.
+    """
+
+    def __init__(self, workers):
+        self.workers = workers
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._ticker = None
+
+    def submit(self, evaluation_data, progress_token=None):
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "status": "queued",
+            "project_name": evaluation_data.get("project_name"),
+            "eval_name": evaluation_data.get("eval_name"),
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "results_cached": False,
+            "error": None,
+            "progress_token": progress_token,
+            "progress": 0
+        }
+        with self._lock:
+            self._prune()
+            self._jobs[job["job_id"]] = job
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="mcp-eval-job"
+                )
+            if progress_token is not None and self._ticker is None:
+                self._ticker = threading.Thread(
+                    target=self._tick_loop, 
+                    name="eval-job-progress", 
+                    daemon=True
+                )
+                self._ticker.start()
+            self._executor.submit(self._run, job, evaluation_data)
+        self._progress(job, "queued")
+        return self.describe(job)
+
+    def _run(self, job, evaluation_data):
+        self._set_status(job, "running", started_at=time.time())
+        try:
+            result = call_api(
+                "run_evaluation", 
+                client.api_client.run_evaluation, 
+                evaluation_data
+            )
+            self._set_status(job, "fetching_results", result=result)
+            job["results_cached"] = self._cache_results(job)
+        except Exception as e:
+            debug_log(
+                f"Evaluation job failed: {str(e)}", 
+                logging.WARNING, 
+                tool="run_evaluation"
+            )
+            self._set_status(job, "failed", error=str(e), 
+                             finished_at=time.time())
+            return
+        self._set_status(job, "succeeded", finished_at=time.time())
+
+    def _cache_results(self, job):
+        """Fetch the finished run's results into the response cache"""
+        arguments = {
+            "project_name": job["project_name"], 
+            "eval_name": job["eval_name"]
+        }
+        ttl = CACHE_TTLS.get("get_evaluation_results", 0)
+        if not ttl or not all(arguments.values()):
+            return False
+        generation = response_cache.generation
+        try:
+            results = call_api(
+                "get_evaluation_results",
+                client.api_client.fetch_evaluation_results,
+                arguments["project_name"], 
+                arguments["eval_name"]
+            )
+        except Exception as e:
+            # Sonuçlar sonradan get_evaluation_results ile de alınabilir
+            debug_log(
+                f"Fetching evaluation job results failed: {str(e)}", 
+                logging.WARNING, 
+                tool="get_evaluation_results"
+            )
+            return False
+        value = {"content": [{"type": "text", "text": encode_json(results)}]}
+        response_cache.put(
+            cache_key("get_evaluation_results", arguments), value, ttl, 
+            response_size(value), 
+            cache_tags("get_evaluation_results", arguments), generation
+        )
+        return True
+
+    def _set_status(self, job, status, **fields):
+        with self._lock:
+            job.update(fields)
+            job["status"] = status
+        self._progress(job, status)
+
+    def _progress(self, job, message):
+        token = job["progress_token"]
+        if token is None:
+            return
+        with self._lock:
+            job["progress"] += 1
+            params = {"progressToken": token, "progress": job["progress"]}
+            if job["finished_at"] is not None:
+                params["total"] = job["progress"]
+        params["message"] = message
+        send_notification("notifications/progress", params)
+
+    def _tick_loop(self):
+        while True:
+            time.sleep(EVAL_PROGRESS_INTERVAL)
+            with self._lock:
+                running = [
+                    job for job in self._jobs.values() 
+                    if job["finished_at"] is None 
+                    and job["progress_token"] is not None
+                ]
+            for job in running:
+                started = job["started_at"]
+                self._progress(job, (
+                    f"{job['status']} for {time.time() - started:.0f}s" 
+                    if started else job["status"]
+                ))
+
+    def _prune(self):
+        cutoff = time.time() - EVAL_JOB_RETENTION
+        for job_id in [
+            job_id for job_id, job in self._jobs.items() 
+            if job["finished_at"] is not None and job["finished_at"] < cutoff
+        ]:
+            del self._jobs[job_id]
+
+    def describe(self, job):
+        with self._lock:
+            info = {
+                key: value for key, value in job.items() 
+                if key not in ("progress_token", "progress")
+            }
+        end = info["finished_at"] or time.time()
+        if info["started_at"]:
+            info["elapsed_seconds"] = round(end - info["started_at"], 3)
+        return info
+
+    def get(self, job_id):
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id)
+
+    def list(self):
+        with self._lock:
+            self._prune()
+            jobs = list(self._jobs.values())
+        return [self.describe(job) for job in jobs]
+
+
+evaluation_jobs = EvaluationJobs(EVAL_JOB_WORKERS)
+
+
+# MCP resource URI şablonları; okumalar tool'larla aynı yoldan geçer
+RESOURCE_TEMPLATES = [
+    {
+        "uriTemplate": "judgment://project/{project_name}/dataset/{alias}",
+        "name": "dataset",
+        "description": "Examples and traces of a dataset (JSON)",
+        "mimeType": "application/json"
+    },
+    {
+        "uriTemplate": ("judgment://project/{project_name}/evaluation/"
+                        "{eval_name}"),
+        "name": "evaluation",
+        "description": "Results of an evaluation run (JSON)",
+        "mimeType": "application/json"
+    },
+    {
+        "uriTemplate": "judgment://trace/{trace_id}",
+        "name": "trace",
+        "description": "A single trace (JSON)",
+        "mimeType": "application/json"
+    },
+]
+RESOURCE_URI_RE = re.compile(
+    r"^judgment://(?:project/(?P<project_name>[^/?]+)/"
+    r"(?P<kind>dataset|evaluation)/(?P<name>[^/?]+)|"
+    r"trace/(?P<trace_id>[^/?]+))(?:\?(?P<query>.*))?$"
+)
+
+# resources/read ile tek seferde dönen en büyük parça (byte)
+RESOURCE_CHUNK_BYTES = env_int("JUDGMENT_MCP_RESOURCE_CHUNK_BYTES", 1024 * 1024)
+
+# resources/list'te gösterilen, bu oturumda görülen kaynak sayısı
+RESOURCE_LIST_SIZE = env_int("JUDGMENT_MCP_RESOURCE_LIST_SIZE", 200)
+
+
+class ResourceError(Exception):
+    """A resources/read failed; carries the JSON-RPC error code"""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+def resource_uri(kind, *parts):
+    quoted = [urllib.parse.quote(str(part), safe="") for part in parts]
+    if kind == "trace":
+        return f"judgment://trace/{quoted[0]}"
+    return f"judgment://project/{quoted[0]}/{kind}/{quoted[1]}"
+
+
+def parse_resource_uri(uri):
+    """Split a judgment:// URI into (kind, arguments, query)"""
+    match = RESOURCE_URI_RE.match(uri or "")
+    if not match:
+        raise ResourceError(-32602, f"Invalid resource URI: {uri}")
+    query = urllib.parse.parse_qs(match.group("query") or "")
+    unquote = urllib.parse.unquote
+    if match.group("trace_id"):
+        return "trace", {"trace_id": unquote(match.group("trace_id"))}, query
+    project_name = unquote(match.group("project_name"))
+    name = unquote(match.group("name"))
+    if match.group("kind") == "dataset":
+        return "dataset", {"project_name": project_name, "alias": name}, query
+    return (
+        "evaluation", 
+        {"project_name": project_name, "eval_name": name}, 
+        query
+    )
+
+
+def resource_uris(name, arguments):
+    """(uri, label) of resources a successful tool call touched"""
+    project_name = arguments.get("project_name")
+    if name in ("get_dataset", "push_dataset", "push_dataset_from_file", 
+                "export_dataset"):
+        return [(
+            resource_uri("dataset", project_name, arguments.get("alias")),
+            f"Dataset {arguments.get('alias')} ({project_name})"
+        )]
+    if name == "get_trace":
+        return [(
+            resource_uri("trace", arguments.get("trace_id")),
+            f"Trace {arguments.get('trace_id')}"
+        )]
+    if name == "get_traces":
+        return [
+            (resource_uri("trace", trace_id), f"Trace {trace_id}")
+            for trace_id in arguments.get("trace_ids") or []
+        ]
+    if name == "get_evaluation_results":
+        return [(
+            resource_uri(
+                "evaluation", project_name, arguments.get("eval_name")
+            ),
+            f"Evaluation {arguments.get('eval_name')} ({project_name})"
+        )]
+    return []
+
+
+def removed_resource_prefixes(name, arguments):
+    """URI prefixes a delete tool makes stale"""
+    project_name = arguments.get("project_name")
+    if name == "delete_dataset":
+        return [resource_uri("dataset", project_name, arguments.get("alias"))]
+    if name == "delete_trace":
+        return [resource_uri("trace", arguments.get("trace_id"))]
+    if name == "delete_traces":
+        return [
+            resource_uri("trace", trace_id) 
+            for trace_id in arguments.get("trace_ids") or []
+        ]
+    if name == "delete_project":
+        quoted = urllib.parse.quote(str(project_name), safe="")
+        return [f"judgment://project/{quoted}/"]
+    return []
+
+
+class ResourceIndex:
+    """Recently used resources, most recent last, for resources/list"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, uri, label):
+        with self._lock:
+            self._entries.pop(uri, None)
+            self._entries[uri] = label
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard_prefix(self, prefix):
+        with self._lock:
+            for uri in [u for u in self._entries if u.startswith(prefix)]:
+                del self._entries[uri]
+
+    def list(self):
+        with self._lock:
+            entries = list(self._entries.items())
+        resources = []
+        for uri, label in reversed(entries):
+            kind = parse_resource_uri(uri)[0]
+            resources.append({
+                "uri": uri,
+                "name": label,
+                "mimeType": "application/json",
+                "description": f"Judgment {kind}"
+            })
+        return resources
+
+
+resource_index = ResourceIndex(RESOURCE_LIST_SIZE)
+
+
+def track_resources(name, arguments):
+    for prefix in removed_resource_prefixes(name, arguments):
+        resource_index.discard_prefix(prefix)
+    for uri, label in resource_uris(name, arguments):
+        resource_index.add(uri, label)
+
+
+def load_resource_bytes(uri, kind, arguments):
+    """Full JSON body of a resource, fetched through the tools' read paths"""
+    if kind == "dataset":
+        key = ("resource", uri)
+        hit, data = snapshot_cache.get(key)
+        if hit:
+            return data
+        generation = snapshot_cache.generation
+        get_client()
+        try:
+            snapshot = load_dataset_snapshot(
+                arguments["alias"], arguments["project_name"]
+            )
+        except Exception as e:
+            raise ResourceError(-32603, f"Failed to read {uri}: {str(e)}")
+        data = encode_json_bytes({
+            "alias": arguments["alias"],
+            "project_name": arguments["project_name"],
+            "examples": snapshot["examples"],
+            "traces": snapshot["traces"]
+        })
+        if DATASET_SNAPSHOT_TTL:
+            # Parça parça okumalar her seferinde yeniden serialize etmesin;
+            # snapshot_cache büyük gövdeleri de okuma sürdükçe tutar
+            snapshot_cache.put(
+                key, data, DATASET_SNAPSHOT_TTL, len(data),
+                cache_tags("get_dataset", arguments), generation
+            )
+        return data
+    
+    tool_name = "get_trace" if kind == "trace" else "get_evaluation_results"
+    result = execute_tool(tool_name, arguments)
+    text = result["content"][0]["text"]
+    if result.get("isError"):
+        raise ResourceError(-32603, f"Failed to read {uri}: {text}")
+    return text.encode("utf-8")
+
+
+def utf8_boundary(data, index):
+    """Move a byte index forward to the start of a UTF-8 character"""
+    while index < len(data) and (data[index] & 0xC0) == 0x80:
+        index += 1
+    return index
+
+
+def read_resource(params):
+    """resources/read: one byte range of a resource (RESOURCE_CHUNK_BYTES max)
+
+    The range comes from params.offset/params.length or the URI query
+    (?offset=&length=). Boundaries are moved forward to whole UTF-8
+    characters; _meta.next_offset gives where the next chunk starts.
+    """
+    uri = params.get("uri")
+    kind, arguments, query = parse_resource_uri(uri)
+    base_uri = uri.split("?", 1)[0]
+    
+    try:
+        offset = int(params.get("offset", query.get("offset", [0])[0]))
+        length = int(params.get(
+            "length", query.get("length", [RESOURCE_CHUNK_BYTES])[0]
+        ))
+    except (TypeError, ValueError):
+        raise ResourceError(-32602, "offset and length must be integers")
+    if offset < 0 or length < 1:
+        raise ResourceError(-32602, "offset must be >= 0 and length >= 1")
+    
+    data = load_resource_bytes(base_uri, kind, arguments)
+    start = utf8_boundary(data, min(offset, len(data)))
+    end = utf8_boundary(
+        data, min(len(data), start + min(length, RESOURCE_CHUNK_BYTES))
+    )
+    return {
+        "contents": [{
+            "uri": base_uri,
+            "mimeType": "application/json",
+            "text": data[start:end].decode("utf-8"),
+            "_meta": {
+                "offset": start,
+                "length": end - start,
+                "total_bytes": len(data),
+                "next_offset": end if end < len(data) else None
+            }
+        }]
+    }
+
+
+def execute_tool(name, arguments):
+    """Execute a tool, serving repeated reads from the response cache"""
+    ttl = CACHE_TTLS.get(name, 0)
+    if ttl:
+        key = cache_key(name, arguments)
+        hit, cached = response_cache.get(key)
+        if hit:
+            return cached
+        generation = response_cache.generation
+    
+    result = run_tool(name, arguments)
+    
+    if ttl and not result.get("isError"):
+        response_cache.put(
+            key, result, ttl, response_size(result), 
+            cache_tags(name, arguments), generation
+        )
+    if not result.get("isError"):
+        track_resources(name, arguments)
+    tags = invalidation_tags(name, arguments)
+    for tag in tags:
+        response_cache.invalidate(tag)
+        snapshot_cache.invalidate(tag)
+        if disk_cache is not None:
+            disk_cache.invalidate(tag)
+    if tags:
+        # Yazmadan önce başlamış okumalara yeni çağıranlar katılmasın
+        read_flight.forget()
+    return result
+
+
+# judgeval client'ı gerektirmeyen, sadece sunucu durumunu okuyan tool'lar
+LOCAL_TOOLS = ("cache_stats", "api_stats", "server_stats", 
+               "get_evaluation_status")
+
+
+def fetch_trace(trace_id, tool_name):
+    """Fetch a trace through the persistent cache and single-flight"""
+    return disk_cached(
+        "trace", str(trace_id), [("trace", trace_id)],
+        lambda: coalesced_call(
+            ("fetch_trace", trace_id), 
+            tool_name, client.api_client.fetch_trace, trace_id
+        )
+    )
+
+
+def tool_get_trace(arguments):
+    """Fetch a single trace by id"""
+    result = fetch_trace(arguments["trace_id"], "get_trace")
+    return {
+        "content": [{
+            "type": "text", 
+            "text": encode_json(result)
+        }]
+    }
+
+
+def tool_delete_trace(arguments):
+    """Delete a single trace by id"""
+    result = call_api(
+        "delete_trace", 
+        client.api_client.delete_trace, 
+        arguments["trace_id"]
+    )
+    return {
+        "content": [{
+            "type": "text", 
+            "text": encode_json(result)
+        }]
+    }
+
+
+def tool_get_traces(arguments):
+    """Fetch many traces in parallel, returned in content chunks"""
+    trace_ids = unique_ids(arguments["trace_ids"])
+    allow_partial = arguments.get("allow_partial", True)
+    chunk_size = max(1, int(
+        arguments.get("chunk_size", BULK_CHUNK_SIZE)
+    ))
+    outcomes = fan_out(
+        lambda trace_id: fetch_trace(trace_id, "get_traces"), 
+        trace_ids,
+        int(arguments.get("max_workers", BULK_MAX_WORKERS)),
+        stop_on_error=not allow_partial
+    )
+    
+    traces = [
+        {"trace_id": trace_id, "trace": result}
+        for trace_id, (result, error) in outcomes.items() 
+        if error is None
+    ]
+    errors = {
+        trace_id: error 
+        for trace_id, (result, error) in outcomes.items() 
+        if error is not None
+    }
+    summary = {
+        "requested": len(trace_ids),
+        "succeeded": len(traces),
+        "failed": len(errors),
+        "skipped": len(trace_ids) - len(outcomes),
+        "chunks": (len(traces) + chunk_size - 1) // chunk_size,
+        "errors": errors
+    }
+    
+    # Her chunk ayrı bir content parçası; tek dev metin yerine
+    content = [{"type": "text", "text": encode_json(summary)}]
+    for start in range(0, len(traces), chunk_size):
+        content.append({
+            "type": "text", 
+            "text": encode_json({
+                "chunk": start // chunk_size,
+                "traces": traces[start:start + chunk_size]
+            })
+        })
+    return {
+        "content": content,
+        "isError": bool(errors) and not allow_partial
+    }
+
+
+def tool_delete_traces(arguments):
+    """Delete many traces in parallel"""
+    trace_ids = unique_ids(arguments["trace_ids"])
+    allow_partial = arguments.get("allow_partial", True)
+    outcomes = fan_out(
+        lambda trace_id: call_api(
+            "delete_traces", client.api_client.delete_trace, trace_id
+        ), 
+        trace_ids,
+        int(arguments.get("max_workers", BULK_MAX_WORKERS)),
+        stop_on_error=not allow_partial
+    )
+    
+    results = []
+    for trace_id in trace_ids:
+        if trace_id not in outcomes:
+            results.append({"trace_id": trace_id, "status": "skipped"})
+            continue
+        result, error = outcomes[trace_id]
+        if error is None:
+            results.append({
+                "trace_id": trace_id, 
+                "status": "deleted", 
+                "result": result
+            })
+        else:
+            results.append({
+                "trace_id": trace_id, 
+                "status": "error", 
+                "error": error
+            })
+    failed = sum(1 for r in results if r["status"] == "error")
+    return {
+        "content": [{
+            "type": "text", 
+            "text": encode_json({
+                "requested": len(trace_ids),
+                "deleted": sum(
+                    1 for r in results if r["status"] == "deleted"
+                ),
+                "failed": failed,
+                "results": results
+            })
+        }],
+        "isError": bool(failed) and not allow_partial
+    }
+
+
+def tool_run_evaluation(arguments):
+    """Run an evaluation, or start it as a background job with async"""
+    if arguments.get("async", False):
+        context = current_context()
+        job = evaluation_jobs.submit(
+            arguments["evaluation_data"],
+            context.progress_token if context is not None else None
+        )
+        job["poll_with"] = "get_evaluation_status"
+        return {
+            "content": [{
+                "type": "text", 
+                "text": encode_json(job)
+            }]
+        }
+    
+    result = call_api(
+        "run_evaluation", 
+        client.api_client.run_evaluation,
+        arguments["evaluation_data"]
+    )
+    return {
+        "content": [{
+            "type": "text", 
+            "text": encode_json(result)
+        }]
+    }
+
+
+def tool_get_evaluation_results(arguments):
+    """Fetch the results of an evaluation run"""
+    result = coalesced_call(
+        ("fetch_evaluation_results", arguments["project_name"], 
+         arguments["eval_name"]),
+        "get_evaluation_results",
+        client.api_client.fetch_evaluation_results,
+        arguments["project_name"], 
+        arguments["eval_name"]
+    )
+    return {
+        "content": [{
+            "type": "text", 
+            "text": encode_json(result)
+        }]
+    }
+
+
+def tool_get_dataset(arguments):
+    """Return one page of a (snapshotted) dataset"""
+    try:
+        snapshot = load_dataset_snapshot(
+            arguments["alias"], 
+            arguments["project_name"]
+        )
+        offset = max(0, int(arguments.get("offset", 0)))
+        limit = max(1, int(
+            arguments.get("limit", DATASET_PAGE_SIZE)
+        ))
+        fields = arguments.get("fields")
+        end = offset + limit
+        
+        total_examples = len(snapshot["examples"])
+        total_traces = len(snapshot["traces"])
+        
+        # Dataset nesnesini JSON-serializable formata çevir
+        dataset_dict = {
+            "alias": arguments["alias"],
+            "project_name": arguments["project_name"],
+            "total_examples": total_examples,
+            "total_traces": total_traces,
+            "offset": offset,
+            "limit": limit,
+            "next_offset": (end if end < max(total_examples, 
+                                              total_traces) 
+                            else None),
+            "examples": project_rows(
+                snapshot["examples"][offset:end], fields
+            ),
+            "traces": project_rows(
+                snapshot["traces"][offset:end], fields
+            )
+        }
+        
+        return {
+            "content": [{
+                "type": "text", 
+                "text": encode_json(dataset_dict)
+            }]
+        }
+    except Exception as e:
+        return {
+            "content": [{
+                "type": "text", 
+                "text": encode_json(
+                    {"error": f"Failed to get dataset: {str(e)}"}
+                )
+            }],
+            "isError": True
+        }
+
+
+def tool_push_dataset(arguments):
+    """Create, overwrite or append to a dataset"""
+    try:
+        # Önce projenin var olduğundan emin ol
+        project_status = create_project_if_not_exists(
+            arguments["project_name"]
+        )
+        
+        # Append mode kontrolü
+        overwrite = arguments.get("overwrite", False) 
+        append_mode = arguments.get("append", False)
+        deduplicate = arguments.get("deduplicate", True)
+        traces = arguments.get("traces") or []
+        alias = arguments["alias"]
+        project_name = arguments["project_name"]
+        
+        # Append API varsa ve trace yoksa sadece yeni example'lar
+        # gönderilir, mevcut dataset indirilmez
+        append_api = None
+        if not overwrite and not traces:
+            append_api = get_append_api()
+        
+        # Mevcut dataset'i kontrol et (yalnızca gerektiğinde)
+        existing_examples = []
+        existing_count = None
+        if not (append_mode and append_api is not None):
+            existing_examples = pull_existing_examples(alias, project_name)
+            existing_count = len(existing_examples)
+            dedup_index.reset(project_name, alias, existing_examples)
+        
+        # Eğer hiçbiri belirtilmemişse ve mevcut data varsa, append yap
+        if not overwrite and not append_mode and existing_examples:
+            append_mode = True
+        
+        # Yeni example'ları oluştur
+        new_examples = []
+        for ex in arguments["examples"]:
+            try:
+                new_examples.append(build_example(ex))
+            except Exception as ex_error:
                 return {
                     "content": [{
                         "type": "text", 
-                        "text": json.dumps({
-                            "status": "error", 
-                            "error": error_msg,
-                            "suggestion": ("Verify: 1) Project exists "
-                                         "2) Example format: {input: 'question', "
-                                         "expected_output: 'answer'}")
-                        }, default=str)
+                        "text": encode_json({
+                            "status": "error",
+                            "error": (f"Failed to create example: "
+                                     f"{str(ex_error)}"),
+                            "example_data": ex,
+                            "suggestion": "Check example format"
+                        })
                     }]
                 }
         
-        elif name == "delete_dataset":
-            result = client.delete_dataset(
-                arguments["alias"], 
+        # Dataset'te zaten olan example'ları hash index ile atla
+        candidates = new_examples
+        deduplicated = 0
+        if (deduplicate and not overwrite and append_mode 
+                and existing_count is None 
+                and not dedup_index.has(project_name, alias)):
+            # Index soğuk (örn. restart sonrası): mevcut satırlar bir kez
+            # çekilip hash'lenir, yoksa yeniden denenen append'ler tekrar eder
+            existing_examples = pull_existing_examples(alias, project_name)
+            existing_count = len(existing_examples)
+            dedup_index.reset(project_name, alias, existing_examples)
+        if deduplicate and not overwrite and append_mode:
+            new_examples, deduplicated = dedup_index.filter_new(
+                project_name, alias, candidates
+            )
+        
+        incremental = False
+        if append_mode and append_api is not None:
+            incremental = append_examples(
+                append_api,
+                alias,
+                new_examples,
+                project_name,
+                on_batch=lambda batch: dedup_index.add(
+                    project_name, alias, batch
+                )
+            )
+            if not incremental and existing_count is None:
+                # Dataset henüz yok, klasik push ile oluşturulacak
+                existing_examples = pull_existing_examples(alias, project_name)
+                existing_count = len(existing_examples)
+                dedup_index.reset(project_name, alias, existing_examples)
+                if deduplicate:
+                    new_examples, deduplicated = dedup_index.filter_new(
+                        project_name, alias, candidates
+                    )
+        
+        if incremental:
+            result = True
+            uploaded_count = len(new_examples)
+            total_count = (existing_count + len(new_examples)
+                           if existing_count is not None else None)
+        else:
+            ds = client.create_dataset()
+            
+            # Mevcut example'ları ekle (append mode'da)
+            all_examples = []
+            if append_mode and existing_examples:
+                all_examples.extend(existing_examples)
+            all_examples.extend(new_examples)
+            
+            ds.examples = all_examples
+            ds.traces = [Trace(**t) for t in traces]
+            
+            result = call_api(
+                "push_dataset",
+                client.push_dataset,
+                alias, 
+                ds, 
+                project_name, 
+                overwrite  # append mode'da overwrite=False
+            )
+            uploaded_count = len(all_examples)
+            total_count = len(all_examples)
+            if result:
+                dedup_index.reset(project_name, alias, all_examples)
+        
+        operation_type = ("overwritten" if overwrite 
+                        else ("appended" if append_mode 
+                              else "created"))
+        
+        return {
+            "content": [{
+                "type": "text", 
+                "text": encode_json({
+                    "status": "success",
+                    "operation": operation_type,
+                    "alias": alias,
+                    "project_name": project_name,
+                    "new_examples_added": len(new_examples),
+                    "deduplicated_count": deduplicated,
+                    "existing_examples_count": existing_count,
+                    "total_examples_count": total_count,
+                    "uploaded_examples_count": uploaded_count,
+                    "incremental": incremental,
+                    "project_status": project_status["status"],
+                    "append_mode": append_mode,
+                    "overwrite_mode": overwrite,
+                    "result": bool(result)
+                })
+            }]
+        }
+        
+    except Exception as e:
+        error_msg = str(e)
+        return {
+            "content": [{
+                "type": "text", 
+                "text": encode_json({
+                    "status": "error", 
+                    "error": error_msg,
+                    "suggestion": ("Verify: 1) Project exists "
+                                 "2) Example format: {input: 'question', "
+                                 "expected_output: 'answer'}")
+                })
+            }],
+            "isError": True
+        }
+
+
+def tool_push_dataset_from_file(arguments):
+    """Upload a local JSONL/CSV file in chunks"""
+    # Dosyadan gelen example'lar index'e işlenmiyor, index'i düşür
+    dedup_index.forget(arguments["project_name"], arguments["alias"])
+    try:
+        result = push_dataset_from_file(
+            arguments["alias"],
+            arguments["project_name"],
+            arguments["path"],
+            file_format=arguments.get("format"),
+            chunk_size=max(1, int(
+                arguments.get("chunk_size", APPEND_BATCH_SIZE)
+            )),
+            overwrite=arguments.get("overwrite", False),
+            skip_invalid=arguments.get("skip_invalid", False)
+        )
+    except Exception as e:
+        return {
+            "content": [{
+                "type": "text", 
+                "text": encode_json({
+                    "status": "error", 
+                    "error": str(e),
+                    "suggestion": ("Each row needs input/question and "
+                                 "optionally expected_output/"
+                                 "expected/answer")
+                })
+            }],
+            "isError": True
+        }
+    return {
+        "content": [{
+            "type": "text", 
+            "text": encode_json(result)
+        }]
+    }
+
+
+def tool_export_dataset(arguments):
+    """Stream a dataset to a local JSONL/Parquet file"""
+    try:
+        result = export_dataset(
+            arguments["alias"],
+            arguments["project_name"],
+            arguments["path"],
+            file_format=arguments.get("format"),
+            include_traces=arguments.get("include_traces", True),
+            overwrite=arguments.get("overwrite", False)
+        )
+    except Exception as e:
+        return {
+            "content": [{
+                "type": "text", 
+                "text": encode_json({
+                    "status": "error", 
+                    "error": f"Failed to export dataset: {str(e)}"
+                })
+            }],
+            "isError": True
+        }
+    return {
+        "content": [{
+            "type": "text", 
+            "text": encode_json(result)
+        }]
+    }
+
+
+def tool_summarize_evaluation_results(arguments):
+    """Aggregate one evaluation run, or compare two runs side by side"""
+    project_name = arguments["project_name"]
+    eval_names = [arguments["eval_name"]]
+    if arguments.get("compare_eval_name"):
+        eval_names.append(arguments["compare_eval_name"])
+    bins = arguments.get("bins", 10)
+    max_failing_ids = arguments.get("max_failing_ids", 100)
+    
+    outcomes = fan_out(
+        lambda eval_name: summarize_results(
+            load_evaluation_results(project_name, eval_name), 
+            bins, max_failing_ids
+        ),
+        eval_names,
+        len(eval_names)
+    )
+    errors = {
+        eval_name: error 
+        for eval_name, (result, error) in outcomes.items() if error
+    }
+    if errors:
+        return {
+            "content": [{
+                "type": "text", 
+                "text": encode_json({
+                    "error": "Failed to summarize evaluation results", 
+                    "errors": errors
+                })
+            }],
+            "isError": True
+        }
+    
+    summary, failing = outcomes[eval_names[0]][0]
+    result = {
+        "project_name": project_name,
+        "eval_name": eval_names[0],
+        "engine": "numpy" if load_numpy() is not None else "python",
+        "summary": summary
+    }
+    if len(eval_names) > 1:
+        other, other_failing = outcomes[eval_names[1]][0]
+        result["compare_eval_name"] = eval_names[1]
+        result["compare_summary"] = other
+        result["comparison"] = compare_summaries(
+            summary, other, failing, other_failing, max_failing_ids
+        )
+    return {
+        "content": [{
+            "type": "text", 
+            "text": encode_json(result)
+        }]
+    }
+
+
+def tool_get_evaluation_status(arguments):
+    """Report one background evaluation job, or all of them"""
+    job_id = arguments.get("job_id")
+    if not job_id:
+        return {
+            "content": [{
+                "type": "text", 
+                "text": encode_json({"jobs": evaluation_jobs.list()})
+            }]
+        }
+    
+    job = evaluation_jobs.get(job_id)
+    if job is None:
+        return {
+            "content": [{
+                "type": "text", 
+                "text": encode_json({
+                    "error": f"Unknown or expired evaluation job: {job_id}"
+                })
+            }],
+            "isError": True
+        }
+    return {
+        "content": [{
+            "type": "text", 
+            "text": encode_json(evaluation_jobs.describe(job))
+        }]
+    }
+
+
+def tool_delete_dataset(arguments):
+    """Delete a dataset"""
+    dedup_index.forget(arguments["project_name"], arguments["alias"])
+    result = call_api(
+        "delete_dataset",
+        client.delete_dataset,
+        arguments["alias"], 
+        arguments["project_name"]
+    )
+    return {
+        "content": [{
+            "type": "text", 
+            "text": encode_json(result)
+        }]
+    }
+
+
+def tool_create_project(arguments):
+    """Create a project unless it is already known to exist"""
+    if arguments["project_name"] in known_projects:
+        # Bu oturumda zaten doğrulandı, API'ye gitmeye gerek yok
+        known_projects.skip()
+        result = {
+            "status": "already_exists", 
+            "project_name": arguments["project_name"], 
+            "message": "Project already exists"
+        }
+    else:
+        try:
+            call_api(
+                "create_project", 
+                client.create_project, 
                 arguments["project_name"]
             )
-            return {
-                "content": [{
-                    "type": "text", 
-                    "text": json.dumps(result, default=str)
-                }]
+            known_projects.add(arguments["project_name"])
+            result = {
+                "status": "created", 
+                "project_name": arguments["project_name"]
             }
-        
-        elif name == "create_project":
-            try:
-                client.create_project(arguments["project_name"])
+        except Exception as e:
+            error_str = str(e)
+            if ("already exists" in error_str.lower() or 
+                    "400" in error_str):
+                known_projects.add(arguments["project_name"])
+                result = {
+                    "status": "already_exists", 
+                    "project_name": arguments["project_name"], 
+                    "message": "Project already exists"
+                }
+            elif ("500" in error_str or 
+                  "internal server error" in error_str.lower()):
+                result = {
+                    "status": "error", 
+                    "project_name": arguments["project_name"], 
+                    "error": ("HTTP 500: Internal Server Error - "
+                            "Judgment API is experiencing issues"),
+                    "suggestion": ("Try again in a few minutes or "
+                                 "check API status")
+                }
+            else:
                 result = {
-                    "status": "created", 
-                    "project_name": arguments["project_name"]
+                    "status": "error", 
+                    "project_name": arguments["project_name"], 
+                    "error": error_str
                 }
+    return {
+        "content": [{
+            "type": "text", 
+            "text": encode_json(result)
+        }]
+    }
+
+
+def tool_delete_project(arguments):
+    """Delete a project"""
+    known_projects.discard(arguments["project_name"])
+    dedup_index.forget(arguments["project_name"])
+    call_api(
+        "delete_project", 
+        client.delete_project, 
+        arguments["project_name"]
+    )
+    result = {
+        "status": "deleted", 
+        "project_name": arguments["project_name"]
+    }
+    return {
+        "content": [{
+            "type": "text", 
+            "text": encode_json(result)
+        }]
+    }
+
+
+def response_cache_stats():
+    """Response cache counters with the TTLs and the snapshot store"""
+    stats = response_cache.stats()
+    stats["ttl_seconds"] = dict(CACHE_TTLS)
+    stats["snapshots"] = snapshot_cache.stats()
+    return stats
+
+
+def tool_cache_stats(arguments):
+    """Report (and optionally clear) the response cache"""
+    if arguments.get("clear", False):
+        response_cache.clear()
+        snapshot_cache.clear()
+        if disk_cache is not None:
+            disk_cache.clear()
+    stats = response_cache_stats()
+    stats["known_projects"] = len(known_projects)
+    stats["skipped_project_checks"] = known_projects.skipped_calls
+    stats["dedup_index"] = dedup_index.stats()
+    if disk_cache is not None:
+        stats["disk"] = disk_cache.stats()
+    return {
+        "content": [{
+            "type": "text", 
+            "text": encode_json(stats)
+        }]
+    }
+
+
+def tool_server_stats(arguments):
+    """Report per-tool metrics with cache and API counters"""
+    stats = {
+        "uptime_seconds": round(time.time() - server_metrics.started),
+        "max_concurrency": MAX_CONCURRENCY,
+        "tools": server_metrics.snapshot(),
+        "cache": response_cache_stats(),
+        "api": api_stats(),
+        "known_projects": len(known_projects)
+    }
+    if arguments.get("format") == "prometheus":
+        text = server_metrics.prometheus_text()
+    else:
+        text = encode_json(stats)
+    return {"content": [{"type": "text", "text": text}]}
+
+
+def tool_api_stats(arguments):
+    """Report Judgment API call counters and breaker state"""
+    return {
+        "content": [{
+            "type": "text", 
+            "text": encode_json(api_stats())
+        }]
+    }
+
+
+# Tool adı -> handler; validator'lar get_tools() şemalarından derlenir
+TOOL_HANDLERS = {
+    "get_trace": tool_get_trace,
+    "delete_trace": tool_delete_trace,
+    "get_traces": tool_get_traces,
+    "delete_traces": tool_delete_traces,
+    "run_evaluation": tool_run_evaluation,
+    "get_evaluation_results": tool_get_evaluation_results,
+    "get_evaluation_status": tool_get_evaluation_status,
+    "summarize_evaluation_results": tool_summarize_evaluation_results,
+    "get_dataset": tool_get_dataset,
+    "push_dataset": tool_push_dataset,
+    "push_dataset_from_file": tool_push_dataset_from_file,
+    "export_dataset": tool_export_dataset,
+    "delete_dataset": tool_delete_dataset,
+    "create_project": tool_create_project,
+    "delete_project": tool_delete_project,
+    "cache_stats": tool_cache_stats,
+    "server_stats": tool_server_stats,
+    "api_stats": tool_api_stats
+}
+
+
+class InvalidParams(Exception):
+    """tools/call arguments do not match the tool's inputSchema (-32602)"""
+
+
+# JSON Schema tipleri -> Python tipleri (bool, int'in alt sınıfı; ayrıca elenir)
+JSON_SCHEMA_TYPES = {
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "object": dict,
+    "array": list,
+}
+
+
+def compile_schema(schema):
+    """Compile a (subset of) JSON Schema into a validator function
+
+    Supports type, enum, minimum, required, properties and items, which is
+    everything get_tools() uses. The returned function takes (value, path)
+    and raises InvalidParams on the first mismatch. Unknown properties are
+    allowed.
+    """
+    checks = []
+    
+    expected = schema.get("type")
+    if expected:
+        python_type = JSON_SCHEMA_TYPES[expected]
+        
+        def check_type(value, path):
+            if isinstance(value, bool) and expected != "boolean":
+                ok = False
+            elif expected == "integer" and isinstance(value, float):
+                ok = value.is_integer()
+            else:
+                ok = isinstance(value, python_type)
+            if not ok:
+                raise InvalidParams(
+                    f"{path}: expected {expected}, "
+                    f"got {type(value).__name__}"
+                )
+        checks.append(check_type)
+    
+    if "enum" in schema:
+        allowed = tuple(schema["enum"])
+        
+        def check_enum(value, path):
+            if value not in allowed:
+                raise InvalidParams(
+                    f"{path}: must be one of "
+                    f"{', '.join(map(str, allowed))}"
+                )
+        checks.append(check_enum)
+    
+    if "minimum" in schema:
+        minimum = schema["minimum"]
+        
+        def check_minimum(value, path):
+            if value < minimum:
+                raise InvalidParams(f"{path}: must be >= {minimum}")
+        checks.append(check_minimum)
+    
+    required = tuple(schema.get("required", ()))
+    properties = {
+        key: compile_schema(sub_schema) 
+        for key, sub_schema in schema.get("properties", {}).items()
+    }
+    if required or properties:
+        def check_object(value, path):
+            for key in required:
+                if key not in value:
+                    raise InvalidParams(f"{path}: missing required '{key}'")
+            for key, validate in properties.items():
+                if key in value:
+                    validate(value[key], f"{path}.{key}")
+        checks.append(check_object)
+    
+    if "items" in schema:
+        validate_item = compile_schema(schema["items"])
+        
+        def check_items(value, path):
+            for index, item in enumerate(value):
+                validate_item(item, f"{path}[{index}]")
+        checks.append(check_items)
+    
+    def validate(value, path="arguments"):
+        for check in checks:
+            check(value, path)
+    return validate
+
+
+# Tüm tools/call'lar için varsayılan süre sınırı (saniye, 0 = yok)
+TOOL_DEADLINE = env_float("JUDGMENT_MCP_TOOL_DEADLINE", 300)
+
+# Kendi süre sınırlarını yöneten uzun işler varsayılan olarak sınırsız
+LONG_RUNNING_TOOLS = ("run_evaluation", "push_dataset_from_file", 
+                      "export_dataset")
+
+
+def tool_deadline(name):
+    """Deadline of a tool: JUDGMENT_MCP_DEADLINE_<TOOL> or the default"""
+    default = 0 if name in LONG_RUNNING_TOOLS else TOOL_DEADLINE
+    return env_float(f"JUDGMENT_MCP_DEADLINE_{name.upper()}", default)
+
+
+def build_tool_registry():
+    """Pair every tool in get_tools() with its handler, validator, deadline"""
+    return {
+        tool["name"]: {
+            "handler": TOOL_HANDLERS[tool["name"]],
+            "validate": compile_schema(tool["inputSchema"]),
+            "deadline": tool_deadline(tool["name"])
+        }
+        for tool in get_tools()
+    }
+
+
+# Startup'ta bir kez derlenir
+TOOL_REGISTRY = build_tool_registry()
+
+
+def validate_tool_call(name, arguments):
+    """Check a tools/call against the tool's schema before any API work"""
+    tool = TOOL_REGISTRY.get(name)
+    if tool is None:
+        raise InvalidParams(f"Unknown tool: {name}")
+    tool["validate"](arguments)
+
+
+def run_tool(name, arguments):
+    """Execute a tool by name with given arguments
+
+    Runs on dispatcher worker threads; stdout is protected process-wide by
+    protect_stdout(), so it must not be swapped here. Arguments are expected
+    to have passed validate_tool_call() already.
+    """
+    tool = TOOL_REGISTRY.get(name)
+    if tool is None:
+        return {
+            "content": [{
+                "type": "text", 
+                "text": f"Unknown tool: {name}"
+            }],
+            "isError": True
+        }
+    
+    if name not in LOCAL_TOOLS:
+        get_client()
+    
+    try:
+        return tool["handler"](arguments)
+    except Exception as e:
+        return {
+            "content": [{"type": "text", "text": f"Error: {str(e)}"}],
+            "isError": True
+        }
+
+
+class ResponseWriter:
+    """Serialized stdout writer shared by the reader loop and tool workers
+
+    Frames are newline-delimited UTF-8 JSON written to a binary stream.
+    Every frame is written and flushed under one lock so responses
+    finishing on different threads never interleave on stdout.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._lock = threading.Lock()
+        self.closed = False
+
+    def write(self, response):
+        """Write one response frame, returns False once the pipe is gone
+
+        Accepts a response dict or an already serialized JSON str/bytes.
+        """
+        if isinstance(response, bytes):
+            frame = response + b"\n"
+        elif isinstance(response, str):
+            frame = response.encode("utf-8") + b"\n"
+        else:
+            frame = encode_json_bytes(response) + b"\n"
+        started = time.perf_counter()
+        with self._lock:
+            if self.closed:
+                return False
+            try:
+                self._stream.write(frame)
+                self._stream.flush()
+            except BrokenPipeError:
+                # Client bağlantıyı kapattı
+                self.closed = True
             except Exception as e:
-                error_str = str(e)
-                if "already exists" in error_str.lower() or "400" in error_str:
-                    result = {
-                        "status": "already_exists", 
-                        "project_name": arguments["project_name"], 
-                        "message": "Project already exists"
-                    }
-                elif ("500" in error_str or 
-                      "internal server error" in error_str.lower()):
-                    result = {
-                        "status": "error", 
-                        "project_name": arguments["project_name"], 
-                        "error": ("HTTP 500: Internal Server Error - "
-                                "Judgment API is experiencing issues"),
-                        "suggestion": ("Try again in a few minutes or "
-                                     "check API status")
-                    }
-                else:
-                    result = {
-                        "status": "error", 
-                        "project_name": arguments["project_name"], 
-                        "error": error_str
-                    }
+                debug_log(f"Error sending response: {str(e)}", logging.ERROR)
+                self.closed = True
+        add_phase_time("write", started)
+        timer = current_timer()
+        if timer is not None:
+            timer.response_bytes += len(frame)
+        return not self.closed
+
+
+def internal_error_response(message, error):
+    """Build a -32603 response for an unexpected failure"""
+    message_id = 1
+    if isinstance(message, dict):
+        message_id = message.get("id", 1)
+    return {
+        "jsonrpc": "2.0",
+        "id": message_id,
+        "error": {
+            "code": -32603, 
+            "message": f"Internal error: {str(error)}"
+        }
+    }
+
+
+# initialize ve tools/list cevapları sabit; bir kez serialize edilir
+INITIALIZE_RESULT_JSON = encode_json({
+    "protocolVersion": "2024-11-05",
+    "capabilities": {
+        "tools": {}, 
+        "resources": {"subscribe": False, "listChanged": False}
+    },
+    "serverInfo": {
+        "name": "judgeval", 
+        "version": "1.0.0"
+    }
+})
+TOOLS_LIST_RESULT_JSON = encode_json({"tools": get_tools()})
+RESOURCE_TEMPLATES_RESULT_JSON = encode_json(
+    {"resourceTemplates": RESOURCE_TEMPLATES}
+)
+
+
+def static_response(message_id, result_json):
+    """Splice a pre-serialized result into a JSON-RPC response frame"""
+    return ('{"jsonrpc":"2.0","id":' + encode_json(message_id) 
+            + ',"result":' + result_json + '}')
+
+
+def handle_message(message):
+    """Build the JSON-RPC response for a single request message"""
+    method = message.get("method")
+    message_id = message.get("id", 1)
+    params = message.get("params", {})
+    
+    if method == "initialize":
+        return static_response(message_id, INITIALIZE_RESULT_JSON)
+    
+    if method == "tools/list":
+        return static_response(message_id, TOOLS_LIST_RESULT_JSON)
+    
+    if method == "tools/call":
+        tool_name = params.get("name")
+        arguments = params.get("arguments")
+        if arguments is None:
+            arguments = {}
+        
+        try:
+            if not tool_name:
+                raise InvalidParams("missing tool name")
+            validate_tool_call(tool_name, arguments)
+        except InvalidParams as e:
             return {
-                "content": [{
-                    "type": "text", 
-                    "text": json.dumps(result, default=str)
-                }]
+                "jsonrpc": "2.0",
+                "id": message_id,
+                "error": {
+                    "code": -32602, 
+                    "message": f"Invalid params: {str(e)}"
+                }
             }
-        
-        elif name == "delete_project":
-            client.delete_project(arguments["project_name"])
-            result = {
-                "status": "deleted", 
-                "project_name": arguments["project_name"]
+        try:
+            result = execute_tool(tool_name, arguments)
+        except JudgevalUnavailable as e:
+            return {
+                "jsonrpc": "2.0",
+                "id": message_id,
+                "error": {"code": -32001, "message": str(e)}
             }
+        return {
+            "jsonrpc": "2.0",
+            "id": message_id,
+            "result": result
+        }
+    
+    if method == "notifications/cancelled":
+        in_flight_requests.cancel((params or {}).get("requestId"))
+        return None
+    
+    if "id" not in message:
+        # Diğer bildirimler (örn. notifications/initialized) cevap almaz
+        return None
+    
+    if method == "resources/templates/list":
+        return static_response(message_id, RESOURCE_TEMPLATES_RESULT_JSON)
+    
+    if method == "resources/list":
+        return {
+            "jsonrpc": "2.0",
+            "id": message_id,
+            "result": {"resources": resource_index.list()}
+        }
+    
+    if method == "resources/read":
+        try:
+            result = read_resource(params or {})
+        except ResourceError as e:
             return {
-                "content": [{
-                    "type": "text", 
-                    "text": json.dumps(result, default=str)
-                }]
+                "jsonrpc": "2.0",
+                "id": message_id,
+                "error": {"code": e.code, "message": str(e)}
             }
-        
-        else:
+        except JudgevalUnavailable as e:
             return {
-                "content": [{
-                    "type": "text", 
-                    "text": f"Unknown tool: {name}"
-                }]
+                "jsonrpc": "2.0",
+                "id": message_id,
+                "error": {"code": -32001, "message": str(e)}
             }
-            
+        return {
+            "jsonrpc": "2.0",
+            "id": message_id,
+            "result": result
+        }
+    
+    if method == "prompts/list":
+        return {
+            "jsonrpc": "2.0",
+            "id": message_id,
+            "result": {"prompts": []}
+        }
+    
+    return {
+        "jsonrpc": "2.0",
+        "id": message_id,
+        "error": {
+            "code": -32601, 
+            "message": f"Method not found: {method}"
+        }
+    }
+
+
+# Worker havuzunda çalışan (API'ye gidebilen) JSON-RPC metotları
+WORKER_METHODS = ("tools/call", "resources/read")
+
+
+def begin_request(message):
+    """Create the RequestContext of a tools/call or resources/read as soon
+    as it is read
+
+    Registered before the call is queued so a cancellation can reach it
+    even while it waits for a worker. The deadline comes from
+    params._meta.deadline_seconds or the tool's configured deadline.
+    """
+    if not isinstance(message, dict):
+        return None
+    method = message.get("method")
+    if method not in WORKER_METHODS:
+        return None
+    params = message.get("params") or {}
+    name = params.get("name") if method == "tools/call" else method
+    deadline = TOOL_REGISTRY.get(name, {}).get("deadline", TOOL_DEADLINE)
+    meta = params.get("_meta") or {}
+    override = meta.get("deadline_seconds") if isinstance(meta, dict) else None
+    if isinstance(override, (int, float)) and not isinstance(override, bool):
+        deadline = max(0.0, float(override))
+    context = RequestContext(message.get("id"), name, deadline)
+    if isinstance(meta, dict):
+        context.progress_token = meta.get("progressToken")
+    if "id" in message:
+        in_flight_requests.add(context)
+    return context
+
+
+def process_message(message, parse_ms=0.0, context=None):
+    """Run one request on a worker thread and return its response
+
+    tools/call requests get a RequestTimer and their RequestContext bound
+    to the thread; call finish_request() once the response has been
+    written. Returns None when the request was cancelled.
+    """
+    if message.get("method") == "tools/call":
+        _request_local.timer = RequestTimer(
+            (message.get("params") or {}).get("name"), parse_ms
+        )
+    _request_local.context = context
+    try:
+        if context is not None:
+            context.check()
+        return handle_message(message)
+    except RequestCancelled:
+        return None
     except Exception as e:
-        return {"content": [{"type": "text", "text": f"Error: {str(e)}"}]}
+        return internal_error_response(message, e)
     finally:
-        # Restore stdout
-        sys.stdout.close()
-        sys.stdout = original_stdout
+        _request_local.context = None
+        if context is not None:
+            in_flight_requests.remove(context)
+
+
+def finish_request(message, response):
+    """Record metrics and the latency log line of a finished tools/call"""
+    timer = current_timer()
+    if timer is None:
+        return
+    _request_local.timer = None
+    if response is None:
+        status = "cancelled"
+    elif isinstance(response, dict) and (
+        "error" in response or response.get("result", {}).get("isError")
+    ):
+        status = "error"
+    else:
+        status = "ok"
+    total_ms = server_metrics.record(timer, status)
+    debug_log(
+        "tools/call finished", 
+        logging.INFO,
+        request_id=message.get("id"),
+        tool=timer.tool,
+        latency_ms=round(total_ms, 2),
+        status=status
+    )
+
+
+def is_cancelled(context):
+    return context is not None and context.cancelled.is_set()
+
+
+def dispatch_message(message, writer, parse_ms=0.0, context=None):
+    """Worker entry point: run one request and write its response
+
+    Cancelled requests get no response, not even a late one.
+    """
+    response = process_message(message, parse_ms, context)
+    if response is not None and not is_cancelled(context):
+        writer.write(response)
+    else:
+        response = None
+    finish_request(message, response)
+
+
+def invalid_request_response(message_id=None):
+    return {
+        "jsonrpc": "2.0",
+        "id": message_id,
+        "error": {"code": -32600, "message": "Invalid Request"}
+    }
+
+
+class BatchCollector:
+    """Collects the responses of one JSON-RPC batch into a single frame
+
+    Members run in parallel on the dispatcher pool; each serializes its own
+    response and is charged for those bytes, and whichever finishes last
+    writes the combined array without charging the frame to its own timer.
+    Notifications (members without an id) get no entry, and a batch of
+    only notifications writes nothing.
+    """
+
+    def __init__(self, size, writer):
+        self._responses = [None] * size
+        self._pending = size
+        self._lock = threading.Lock()
+        self._writer = writer
+
+    def run_member(self, index, message, parse_ms=0.0, context=None):
+        if not isinstance(message, dict):
+            self._finish(index, encode_json_bytes(invalid_request_response()))
+            return
+        response = process_message(message, parse_ms, context)
+        if is_cancelled(context):
+            response = None
+        part = None
+        if response is not None and "id" in message:
+            part = (response.encode("utf-8") if isinstance(response, str) 
+                    else encode_json_bytes(response))
+            timer = current_timer()
+            if timer is not None:
+                # Birleşik frame'de bu üyenin payı (ayraç dahil)
+                timer.response_bytes += len(part) + 1
+        self._finish(index, part)
+        finish_request(message, response)
+
+    def _finish(self, index, part):
+        with self._lock:
+            self._responses[index] = part
+            self._pending -= 1
+            if self._pending:
+                return
+        parts = [p for p in self._responses if p is not None]
+        if not parts:
+            return
+        # Frame'in tamamı son biten üyeye yazılmasın; payları yukarıda
+        timer = current_timer()
+        _request_local.timer = None
+        try:
+            self._writer.write(b"[" + b",".join(parts) + b"]")
+        finally:
+            _request_local.timer = timer
+
+
+def dispatch_batch(batch, executor, writer, parse_ms=0.0):
+    """Fan a JSON-RPC batch out to the worker pool"""
+    if not batch:
+        writer.write(invalid_request_response())
+        return
+    collector = BatchCollector(len(batch), writer)
+    # Parse süresi batch üyeleri arasında paylaştırılır
+    member_parse_ms = parse_ms / len(batch)
+    for index, member in enumerate(batch):
+        executor.submit(
+            collector.run_member, index, member, member_parse_ms, 
+            begin_request(member)
+        )
 
 
 def main():
     """Main MCP server function"""
+    global notification_writer
+    writer = ResponseWriter(protect_stdout())
+    notification_writer = writer
+    
     # API key kontrolü
     if not JUDGMENT_API_KEY:
-        debug_log("ERROR: No API key provided")
+        debug_log("No API key provided", logging.ERROR)
         # API key olmadığında tüm mesajlara hata döndür
-        for line in sys.stdin:
+        for line in sys.stdin.buffer:
             line = line.strip()
             if not line:
                 continue
-                
+            
+            message = None
             try:
-                message = json.loads(line)
-                method = message.get("method")
-                message_id = message.get("id", 1)
-                
+                message = decode_json(line)
                 response = {
                     "jsonrpc": "2.0",
-                    "id": message_id,
+                    "id": message.get("id", 1),
                     "error": {
                         "code": -32000, 
                         "message": "No API key provided"
                     }
                 }
-                try:
-                    print(json.dumps(response))
-                    sys.stdout.flush()
-                except BrokenPipeError:
-                    # Client bağlantıyı kapattı, server'ı kapat
-                    break
-                except Exception as e:
-                    # Diğer hataları logla ama devam et
-                    debug_log(f"Error sending response: {str(e)}")
-                    break
-                    
             except Exception as e:
-                error_response = {
-                    "jsonrpc": "2.0",
-                    "id": (message.get("id", 1) if 'message' in locals() 
-                           else 1),
-                    "error": {
-                        "code": -32603, 
-                        "message": f"Internal error: {str(e)}"
-                    }
-                }
-                try:
-                    print(json.dumps(error_response))
-                    sys.stdout.flush()
-                except BrokenPipeError:
-                    break
-                except Exception as ex:
-                    debug_log(f"Error sending error response: {str(ex)}")
-                    break
+                response = internal_error_response(message, e)
+            
+            if not writer.write(response):
+                # Client bağlantıyı kapattı, server'ı kapat
+                break
+        return
     
-    # Client'ı oluştur
-    try:
-        client = JudgmentClient()
-    except Exception as e:
-        debug_log(f"Client creation error: {str(e)}")
-        # Client oluşturulamadığında tüm mesajlara hata döndür
-        for line in sys.stdin:
-            line = line.strip()
-            if not line:
-                continue
-                
-            try:
-                message = json.loads(line)
-                method = message.get("method")
-                message_id = message.get("id", 1)
-                
-                response = {
-                    "jsonrpc": "2.0",
-                    "id": message_id,
-                    "error": {
-                        "code": -32001, 
-                        "message": f"Client creation error: {str(e)}"
-                    }
-                }
-                try:
-                    print(json.dumps(response))
-                    sys.stdout.flush()
-                except BrokenPipeError:
-                    # Client bağlantıyı kapattı, server'ı kapat
-                    break
-                except Exception as ex:
-                    # Diğer hataları logla ama devam et
-                    debug_log(f"Error sending response: {str(ex)}")
-                    break
-                    
-            except Exception as ex:
-                error_response = {
-                    "jsonrpc": "2.0",
-                    "id": (message.get("id", 1) if 'message' in locals() 
-                           else 1),
-                    "error": {
-                        "code": -32603, 
-                        "message": f"Internal error: {str(ex)}"
-                    }
-                }
-                try:
-                    print(json.dumps(error_response))
-                    sys.stdout.flush()
-                except BrokenPipeError:
-                    break
-                except Exception as e:
-                    debug_log(f"Error sending error response: {str(e)}")
-                    break
+    executor = ThreadPoolExecutor(
+        max_workers=MAX_CONCURRENCY,
+        thread_name_prefix="mcp-tool"
+    )
     
-    tools = get_tools()
+    metrics_file = os.getenv("JUDGMENT_MCP_METRICS_FILE")
+    if metrics_file:
+        threading.Thread(
+            target=metrics_dump_loop,
+            args=(metrics_file, 
+                  env_float("JUDGMENT_MCP_METRICS_INTERVAL", 15) or 15),
+            name="metrics-dump",
+            daemon=True
+        ).start()
     
-    # Suppress stdout during execution to prevent JSON parse errors
-    original_stdout = sys.stdout
-    sys.stdout = open(os.devnull, 'w')
+    # judgeval'i arka planda hazırla; initialize/tools/list beklemez
+    if os.getenv("JUDGMENT_MCP_EAGER_WARMUP", "1") != "0":
+        threading.Thread(
+            target=warm_up_client, 
+            name="judgeval-warmup", 
+            daemon=True
+        ).start()
     
     try:
-        for line in sys.stdin:
+        for line in sys.stdin.buffer:
+            if writer.closed:
+                # Client bağlantıyı kapattı, server'ı kapat
+                break
+            
             line = line.strip()
             if not line:
                 continue
                 
+            message = None
             try:
-                message = json.loads(line)
-                method = message.get("method")
-                message_id = message.get("id", 1)
-                params = message.get("params", {})
-                
-                if method == "initialize":
-                    response = {
-                        "jsonrpc": "2.0",
-                        "id": message_id,
-                        "result": {
-                            "protocolVersion": "2024-11-05",
-                            "capabilities": {"tools": {}},
-                            "serverInfo": {
-                                "name": "judgeval", 
-                                "version": "1.0.0"
-                            }
-                        }
-                    }
-                
-                elif method == "tools/list":
-                    response = {
-                        "jsonrpc": "2.0",
-                        "id": message_id,
-                        "result": {"tools": tools}
-                    }
-                
-                elif method == "tools/call":
-                    tool_name = params.get("name")
-                    arguments = params.get("arguments", {})
-                    
-                    if not tool_name:
-                        response = {
-                            "jsonrpc": "2.0",
-                            "id": message_id,
-                            "error": {
-                                "code": -32602, 
-                                "message": "Invalid params: missing tool name"
-                            }
-                        }
-                    else:
-                        result = execute_tool(tool_name, arguments)
-                        response = {
-                            "jsonrpc": "2.0",
-                            "id": message_id,
-                            "result": result
-                        }
+                parse_started = time.perf_counter()
+                message = decode_json(line)
+                parse_ms = (time.perf_counter() - parse_started) * 1000
                 
-                elif method in ["resources/list", "prompts/list"]:
-                    key = ("resources" if method == "resources/list" 
-                           else "prompts")
-                    response = {
-                        "jsonrpc": "2.0",
-                        "id": message_id,
-                        "result": {key: []}
-                    }
+                # JSON-RPC batch: üyeler paralel çalışır, tek cevap yazılır
+                if isinstance(message, list):
+                    dispatch_batch(message, executor, writer, parse_ms)
+                    continue
                 
-                else:
-                    response = {
-                        "jsonrpc": "2.0",
-                        "id": message_id,
-                        "error": {
-                            "code": -32601, 
-                            "message": f"Method not found: {method}"
-                        }
-                    }
+                # Tool çağrıları ve kaynak okumaları paralel çalışır, cevap 
+                # hazır olunca yazılır
+                if message.get("method") in WORKER_METHODS:
+                    executor.submit(
+                        dispatch_message, message, writer, parse_ms, 
+                        begin_request(message)
+                    )
+                    continue
                 
-                # Restore stdout temporarily to print response
-                sys.stdout.close()
-                sys.stdout = original_stdout
-                try:
-                    print(json.dumps(response))
-                    sys.stdout.flush()
-                except BrokenPipeError:
-                    # Client bağlantıyı kapattı, server'ı kapat
-                    break
-                except Exception as e:
-                    # Diğer hataları logla ama devam et
-                    debug_log(f"Error sending response: {str(e)}")
-                    break
-                # Suppress stdout again
-                sys.stdout = open(os.devnull, 'w')
+                # notifications/cancelled burada, okuma thread'inde işlenir
+                response = handle_message(message)
                 
             except Exception as e:
-                # Restore stdout temporarily to print error
-                sys.stdout.close()
-                sys.stdout = original_stdout
-                error_response = {
-                    "jsonrpc": "2.0",
-                    "id": (message.get("id", 1) if 'message' in locals() 
-                           else 1),
-                    "error": {
-                        "code": -32603, 
-                        "message": f"Internal error: {str(e)}"
-                    }
-                }
-                try:
-                    print(json.dumps(error_response))
-                    sys.stdout.flush()
-                except BrokenPipeError:
-                    # Client bağlantıyı kapattı, server'ı kapat
-                    break
-                except Exception as ex:
-                    # Diğer hataları logla ama devam et
-                    debug_log(f"Error sending error response: {str(ex)}")
-                    break
-                # Suppress stdout again
-                sys.stdout = open(os.devnull, 'w')
+                response = internal_error_response(message, e)
+            
+            if response is not None and not writer.write(response):
+                break
     finally:
-        # Restore stdout
-        sys.stdout.close()
-        sys.stdout = original_stdout
+        # Bekleyen tool çağrılarının cevaplarını yazmasına izin ver
+        executor.shutdown(wait=True)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,78 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server  # noqa: E402
+
+
+class FakeExample:
+    def __init__(self, input=None, expected_output=None, actual_output=None,
+                 context=None, name=None):
+        self.input = input
+        self.expected_output = expected_output
+        self.actual_output = actual_output
+        self.context = context
+        self.name = name
+
+
+class FakeDataset:
+    def __init__(self, examples=None):
+        self.examples = list(examples or [])
+        self.traces = []
+
+
+class FakeDatasetClient:
+    """In-memory datasets with an append API and scripted append failures"""
+
+    def __init__(self):
+        self.datasets = {}
+        self.calls = []
+        self.append_errors = []
+
+    def create_project(self, project_name):
+        raise Exception("400: project already exists")
+
+    def create_dataset(self):
+        return FakeDataset()
+
+    def pull_dataset(self, alias, project_name):
+        self.calls.append("pull_dataset")
+        if (alias, project_name) not in self.datasets:
+            raise Exception("404: Dataset not found")
+        return FakeDataset(self.datasets[(alias, project_name)])
+
+    def push_dataset(self, alias, dataset, project_name, overwrite=False):
+        # Gerçek API gibi: overwrite=False da dataset'in tamamını yazar
+        self.calls.append("push_dataset")
+        self.datasets[(alias, project_name)] = list(dataset.examples)
+        return True
+
+    def append_dataset(self, alias, examples, project_name):
+        self.calls.append("append_dataset")
+        if self.append_errors:
+            raise self.append_errors.pop(0)
+        if (alias, project_name) not in self.datasets:
+            raise Exception("404: Dataset not found")
+        self.datasets[(alias, project_name)].extend(examples)
+        return True
+
+    def seed(self, alias, project_name, rows):
+        self.datasets[(alias, project_name)] = [
+            FakeExample(input=f"q{i}", expected_output=f"a{i}")
+            for i in range(rows)
+        ]
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    """Route dataset tools to a FakeDatasetClient with fresh server state"""
+    fake = FakeDatasetClient()
+    monkeypatch.setattr(server, "client", fake)
+    monkeypatch.setattr(server, "Example", FakeExample)
+    monkeypatch.setattr(server, "api_breaker", server.CircuitBreaker(5, 30))
+    monkeypatch.setattr(server, "dedup_index", server.DedupIndex())
+    monkeypatch.setattr(server, "disk_cache", None)
+    return fake
@@ -0,0 +1,62 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server  # noqa: E402
+
+
+@pytest.fixture
+def half_open_breaker(monkeypatch):
+    """A breaker opened by one failure whose reset timeout already passed"""
+    breaker = server.CircuitBreaker(1, 0.01)
+    monkeypatch.setattr(server, "api_breaker", breaker)
+    breaker.record_failure()
+    time.sleep(0.02)
+    return breaker
+
+
+def call_as_request(context, fn):
+    server._request_local.context = context
+    try:
+        return server.call_api("get_trace", fn)
+    finally:
+        server._request_local.context = None
+
+
+def test_cancelled_probe_does_not_wedge_half_open_breaker(half_open_breaker):
+    context = server.RequestContext("probe", "get_trace", 0)
+    started = threading.Event()
+
+    def slow_probe():
+        started.set()
+        time.sleep(0.5)
+        return "late"
+
+    def cancel():
+        started.wait(1)
+        context.cancelled.set()
+
+    threading.Thread(target=cancel, daemon=True).start()
+    with pytest.raises(server.RequestCancelled):
+        call_as_request(context, slow_probe)
+
+    assert half_open_breaker.stats()["state"] == "half_open"
+    assert server.call_api("get_trace", lambda: "ok") == "ok"
+    assert half_open_breaker.stats()["state"] == "closed"
+
+
+def test_probe_past_deadline_does_not_wedge_half_open_breaker(
+    half_open_breaker,
+):
+    context = server.RequestContext("probe", "get_trace", 0.05)
+
+    with pytest.raises(server.DeadlineExceeded):
+        call_as_request(context, lambda: time.sleep(0.5))
+
+    assert server.call_api("get_trace", lambda: "ok") == "ok"
+    assert half_open_breaker.stats()["state"] == "closed"
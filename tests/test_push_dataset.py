@@ -0,0 +1,63 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server  # noqa: E402
+
+
+def push(arguments):
+    result = server.execute_tool("push_dataset", dict(
+        {"alias": "ds", "project_name": "project"}, **arguments
+    ))
+    return result, json.loads(result["content"][0]["text"])
+
+
+def test_transient_first_append_error_is_not_turned_into_full_push(
+    fake_client,
+):
+    fake_client.seed("ds", "project", 1000)
+    fake_client.append_errors.append(Exception("503 Service Unavailable"))
+
+    result, body = push({
+        "examples": [{"input": "new", "expected_output": "row"}],
+        "append": True,
+        "deduplicate": False,
+    })
+
+    assert result.get("isError")
+    assert body["status"] == "error"
+    assert "pull_dataset" not in fake_client.calls
+    assert "push_dataset" not in fake_client.calls
+    assert len(fake_client.datasets[("ds", "project")]) == 1000
+
+
+def test_missing_dataset_falls_back_to_first_push(fake_client):
+    result, body = push({
+        "examples": [{"input": "new", "expected_output": "row"}],
+        "append": True,
+    })
+
+    assert not result.get("isError")
+    assert body["status"] == "success"
+    assert len(fake_client.datasets[("ds", "project")]) == 1
+
+
+def test_undeduplicated_append_does_not_mark_dataset_as_indexed(fake_client):
+    fake_client.seed("ds", "project", 1)
+
+    push({
+        "examples": [{"input": "q3", "expected_output": "a3"}],
+        "append": True,
+        "deduplicate": False,
+    })
+    result, body = push({
+        "examples": [{"input": "q0", "expected_output": "a0"}],
+        "append": True,
+    })
+
+    assert body["deduplicated_count"] == 1
+    assert [ex.input for ex in fake_client.datasets[("ds", "project")]] == [
+        "q0", "q3"
+    ]
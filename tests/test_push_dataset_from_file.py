@@ -0,0 +1,50 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server  # noqa: E402
+
+
+def push_file(tmp_path, rows=5):
+    path = tmp_path / "rows.jsonl"
+    path.write_text("".join(
+        json.dumps({"input": f"file-q{i}", "expected_output": f"a{i}"}) + "\n"
+        for i in range(rows)
+    ))
+    result = server.execute_tool("push_dataset_from_file", {
+        "alias": "ds", "project_name": "project", "path": str(path)
+    })
+    return result, json.loads(result["content"][0]["text"])
+
+
+def test_transient_append_error_does_not_replace_dataset(fake_client, tmp_path):
+    fake_client.seed("ds", "project", 1000)
+    fake_client.append_errors.append(Exception("503 Service Unavailable"))
+
+    result, body = push_file(tmp_path)
+
+    assert result.get("isError")
+    assert "push_dataset" not in fake_client.calls
+    assert len(fake_client.datasets[("ds", "project")]) == 1000
+
+
+def test_not_found_append_on_existing_dataset_does_not_replace_it(
+    fake_client, tmp_path,
+):
+    fake_client.seed("ds", "project", 1000)
+    fake_client.append_errors.append(Exception("404: Dataset not found"))
+
+    result, body = push_file(tmp_path)
+
+    assert result.get("isError")
+    assert "push_dataset" not in fake_client.calls
+    assert len(fake_client.datasets[("ds", "project")]) == 1000
+
+
+def test_missing_dataset_is_created_from_first_chunk(fake_client, tmp_path):
+    result, body = push_file(tmp_path)
+
+    assert body["operation"] == "created"
+    assert len(fake_client.datasets[("ds", "project")]) == 5
@@ -0,0 +1,95 @@
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server  # noqa: E402
+
+
+class SlowDatasetClient:
+    def __init__(self, delay):
+        self.delay = delay
+        self.pulls = 0
+        self._lock = threading.Lock()
+
+    def pull_dataset(self, alias, project_name):
+        with self._lock:
+            self.pulls += 1
+        time.sleep(self.delay)
+        dataset = type("Dataset", (), {})()
+        dataset.examples = []
+        dataset.traces = []
+        return dataset
+
+
+@pytest.fixture
+def small_flight_pool(monkeypatch):
+    """Single-flight with a 2-thread leader pool and a slow fake client"""
+    flight = server.SingleFlight()
+    flight._executor = ThreadPoolExecutor(
+        max_workers=2, thread_name_prefix="mcp-flight"
+    )
+    fake = SlowDatasetClient(0.2)
+    monkeypatch.setattr(server, "read_flight", flight)
+    monkeypatch.setattr(server, "client", fake)
+    monkeypatch.setattr(server, "api_breaker", server.CircuitBreaker(5, 30))
+    monkeypatch.setattr(server, "snapshot_cache", server.ResponseCache(
+        1024 * 1024, keep_oversized=True, sliding=True, name="snapshot"
+    ))
+    yield fake
+    flight._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def load_snapshot(alias, deadline_seconds):
+    context = server.RequestContext(alias, "get_dataset", deadline_seconds)
+    server._request_local.context = context
+    try:
+        return server.load_dataset_snapshot(alias, "project")
+    finally:
+        server._request_local.context = None
+
+
+def test_abandoned_snapshot_leaders_do_not_deadlock_full_pool(
+    small_flight_pool,
+):
+    errors = []
+
+    def impatient(alias):
+        try:
+            load_snapshot(alias, 0.05)
+        except server.DeadlineExceeded as e:
+            errors.append(e)
+
+    callers = [
+        threading.Thread(target=impatient, args=(f"dataset-{i}",))
+        for i in range(6)
+    ]
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join()
+    assert len(errors) == 6
+
+    snapshot = load_snapshot("healthy", 5)
+
+    assert snapshot == {"examples": [], "traces": []}
+    assert small_flight_pool.pulls == 7
+
+
+def test_do_from_a_leader_runs_inline(small_flight_pool):
+    inner = []
+
+    def outer():
+        inner.append(server.read_flight.do(("inner",), lambda: "pulled"))
+        return threading.current_thread().name
+
+    name = server.read_flight.do(("outer",), outer)
+
+    assert name.startswith("mcp-flight")
+    assert inner == ["pulled"]
+    assert server.read_flight.stats()["leader_calls"] == 1